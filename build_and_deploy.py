@@ -5,13 +5,24 @@ Builds Docker image with full AgentCore capabilities and deploys to AWS
 """
 
 import os
+import re
 import json
+import asyncio
+import hashlib
 import boto3
 import subprocess
+import sys
 import time
+import random
 from datetime import datetime
+from botocore.config import Config
 from dotenv import load_dotenv
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Load environment variables (but not AWS credentials - use AWS CLI instead)
 load_dotenv()
 
@@ -21,6 +32,42 @@ for aws_key in ['AWS_ACCESS_KEY_ID', 'AWS_SECRET_ACCESS_KEY', 'AWS_SESSION_TOKEN
     if aws_key in os.environ:
         del os.environ[aws_key]
 
+def _log(*lines):
+    """Write one or more lines to stdout with a single write call"""
+    sys.stdout.write('\n'.join(lines) + '\n')
+
+def _json_dumps(obj, indent=False):
+    """Serialize to a JSON string, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else None).decode()
+    if indent:
+        return json.dumps(obj, indent=2)
+    return json.dumps(obj, separators=(',', ':'))
+
+# Shared client config: adaptive retries back off on throttling instead of spinning
+_BOTO_CONFIG = Config(retries={'max_attempts': 10, 'mode': 'adaptive'})
+
+_FROM_RE = re.compile(r'^FROM\s+(?:--platform=\S+\s+)?(\S+)', re.IGNORECASE | re.MULTILINE)
+_COPY_RE = re.compile(r'^COPY\s+(.+)$', re.IGNORECASE | re.MULTILINE)
+
+def _build_cache_key(dockerfile='Dockerfile.main'):
+    """Content hash of the Dockerfile and every local file it COPYs"""
+    with open(dockerfile, 'rb') as f:
+        dockerfile_bytes = f.read()
+    
+    digest = hashlib.sha256(dockerfile_bytes)
+    for match in _COPY_RE.finditer(dockerfile_bytes.decode('utf-8')):
+        sources = [arg for arg in match.group(1).split() if not arg.startswith('--')][:-1]
+        for source in sources:
+            digest.update(source.encode('utf-8'))
+            try:
+                with open(source, 'rb') as f:
+                    digest.update(f.read())
+            except OSError:
+                digest.update(b'<missing>')
+    
+    return digest.hexdigest()[:16]
+
 class PropertyPilotAgentCoreBuilder:
     """Enhanced builder for PropertyPilot with full AgentCore capabilities"""
     
@@ -31,95 +78,131 @@ class PropertyPilotAgentCoreBuilder:
         self.repo_name = "propertypilot-gemini-agentcore"
         self.image_tag = "latest"
         self.image_uri = f"{self.ecr_base_uri}/{self.repo_name}:{self.image_tag}"
+        self.cache_tag = f"build-{_build_cache_key()}"
+        self.cache_image_uri = f"{self.ecr_base_uri}/{self.repo_name}:{self.cache_tag}"
         
         # Initialize AWS clients (using default AWS CLI credentials)
-        self.ecr_client = boto3.client('ecr', region_name=self.aws_region)
-        self.bedrock_client = boto3.client('bedrock-agentcore-control', region_name=self.aws_region)
-        self.iam_client = boto3.client('iam', region_name=self.aws_region)
-        self.cognito_client = boto3.client('cognito-idp', region_name=self.aws_region)
-        
-        print("🚀 PropertyPilot AgentCore Builder")
-        print("=" * 50)
-        print(f"AWS Region: {self.aws_region}")
-        print(f"AWS Account: {self.aws_account_id}")
-        print(f"Image URI: {self.image_uri}")
+        self.ecr_client = boto3.client('ecr', region_name=self.aws_region, config=_BOTO_CONFIG)
+        self.bedrock_client = boto3.client('bedrock-agentcore-control', region_name=self.aws_region, config=_BOTO_CONFIG)
+        self.iam_client = boto3.client('iam', region_name=self.aws_region, config=_BOTO_CONFIG)
+        self.cognito_client = boto3.client('cognito-idp', region_name=self.aws_region, config=_BOTO_CONFIG)
+        
+        # Load AgentCore configuration once, and serialize it compactly for the
+        # size-limited AGENTCORE_CONFIG environment variable
+        with open('agentcore_config.json', 'rb') as f:
+            raw_config = f.read()
+        self._config = orjson.loads(raw_config) if orjson is not None else json.loads(raw_config)
+        self._config_blob = _json_dumps(self._config)
+        
+        # Background `docker pull` of the base image, started during setup
+        self._base_image_pull = None
+        
+        _log(
+            "🚀 PropertyPilot AgentCore Builder",
+            "=" * 50,
+            f"AWS Region: {self.aws_region}",
+            f"AWS Account: {self.aws_account_id}",
+            f"Image URI: {self.image_uri}"
+        )
     
     def get_aws_account_id(self):
         """Get AWS account ID"""
         try:
             # Use default AWS credentials (from AWS CLI) instead of .env
-            sts_client = boto3.client('sts', region_name=self.aws_region)
+            sts_client = boto3.client('sts', region_name=self.aws_region, config=_BOTO_CONFIG)
             return sts_client.get_caller_identity()['Account']
         except Exception as e:
-            print(f"❌ Failed to get AWS account ID: {e}")
-            print("💡 Please run 'aws configure' to set up your AWS credentials")
+            _log(f"❌ Failed to get AWS account ID: {e}", "💡 Please run 'aws configure' to set up your AWS credentials")
             return "123456789012"
     
     def check_prerequisites(self):
         """Check if all prerequisites are met"""
-        print("\n🔍 Checking Prerequisites...")
+        _log("\n🔍 Checking Prerequisites...")
         
-        # Check Docker
-        try:
-            result = subprocess.run(['docker', '--version'], capture_output=True, text=True)
-            if result.returncode == 0:
-                print(f"✅ Docker: {result.stdout.strip()}")
-            else:
-                print("❌ Docker not found. Please install Docker Desktop.")
-                return False
-        except FileNotFoundError:
-            print("❌ Docker not found. Please install Docker Desktop.")
+        # Probe Docker and AWS CLI concurrently
+        docker_version, aws_version = asyncio.run(self._probe_cli_versions())
+        
+        if docker_version:
+            _log(f"✅ Docker: {docker_version}")
+        else:
+            _log("❌ Docker not found. Please install Docker Desktop.")
             return False
         
-        # Check AWS CLI
-        try:
-            result = subprocess.run(['aws', '--version'], capture_output=True, text=True)
-            if result.returncode == 0:
-                print(f"✅ AWS CLI: {result.stdout.strip()}")
-            else:
-                print("❌ AWS CLI not found. Please install AWS CLI.")
-                return False
-        except FileNotFoundError:
-            print("❌ AWS CLI not found. Please install AWS CLI.")
+        if aws_version:
+            _log(f"✅ AWS CLI: {aws_version}")
+        else:
+            _log("❌ AWS CLI not found. Please install AWS CLI.")
             return False
         
-        # Check environment variables
+        # Check environment variables against a single snapshot
+        env = dict(os.environ)
         required_vars = ['GEMINI_API_KEY', 'AWS_REGION']
-        missing_vars = [var for var in required_vars if not os.getenv(var)]
+        missing_vars = [var for var in required_vars if not env.get(var)]
         
         if missing_vars:
-            print(f"❌ Missing environment variables: {missing_vars}")
+            _log(f"❌ Missing environment variables: {missing_vars}")
             return False
         else:
-            print("✅ Environment variables configured")
+            _log("✅ Environment variables configured")
         
         # Check AWS credentials (use default AWS CLI credentials)
         try:
-            sts_client = boto3.client('sts', region_name=self.aws_region)
+            sts_client = boto3.client('sts', region_name=self.aws_region, config=_BOTO_CONFIG)
             identity = sts_client.get_caller_identity()
-            print(f"✅ AWS Credentials: {identity['Arn']}")
+            _log(f"✅ AWS Credentials: {identity['Arn']}")
         except Exception as e:
-            print(f"❌ AWS credentials not configured: {e}")
-            print("💡 Please run 'aws configure' to set up your AWS credentials")
+            _log(f"❌ AWS credentials not configured: {e}", "💡 Please run 'aws configure' to set up your AWS credentials")
             return False
         
         return True
     
+    async def _probe_cli_versions(self):
+        """Run the Docker and AWS CLI version checks in parallel"""
+        async def _probe(cmd):
+            try:
+                process = await asyncio.create_subprocess_exec(
+                    *cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+                )
+            except FileNotFoundError:
+                return None
+            stdout, _ = await process.communicate()
+            return stdout.decode().strip() if process.returncode == 0 else None
+        
+        return await asyncio.gather(
+            _probe(['docker', '--version']),
+            _probe(['aws', '--version'])
+        )
+    
     def create_ecr_repository(self):
         """Create ECR repository with enhanced configuration"""
-        print(f"\n📦 Creating ECR Repository: {self.repo_name}")
+        _log(f"\n📦 Creating ECR Repository: {self.repo_name}")
         
-        try:
-            # Check if repository exists
-            self.ecr_client.describe_repositories(repositoryNames=[self.repo_name])
-            print("✅ ECR repository already exists")
-            return True
-        except self.ecr_client.exceptions.RepositoryNotFoundException:
-            pass
+        # Lifecycle policy to manage image retention
+        lifecycle_policy = {
+            "rules": [
+                {
+                    "rulePriority": 1,
+                    "description": "Keep last 10 images",
+                    "selection": {
+                        "tagStatus": "tagged",
+                        "tagPrefixList": ["latest"],
+                        "countType": "imageCountMoreThan",
+                        "countNumber": 10
+                    },
+                    "action": {
+                        "type": "expire"
+                    }
+                }
+            ]
+        }
+        # Canonical text, so the digest doesn't depend on which JSON library is installed
+        lifecycle_policy_text = json.dumps(lifecycle_policy, sort_keys=True, separators=(',', ':'))
+        lifecycle_policy_digest = hashlib.sha256(lifecycle_policy_text.encode()).hexdigest()
         
         try:
-            # Create repository with enhanced configuration
-            response = self.ecr_client.create_repository(
+            # Create optimistically; an existing repository costs the failed create
+            # plus a tag lookup to decide whether the lifecycle policy is current
+            self.ecr_client.create_repository(
                 repositoryName=self.repo_name,
                 imageScanningConfiguration={
                     'scanOnPush': True
@@ -127,79 +210,173 @@ class PropertyPilotAgentCoreBuilder:
                 encryptionConfiguration={
                     'encryptionType': 'AES256'
                 },
-                imageTagMutability='MUTABLE'
+                imageTagMutability='MUTABLE',
+                tags=[
+                    {'Key': 'LifecyclePolicySha256', 'Value': lifecycle_policy_digest}
+                ]
+            )
+        except self.ecr_client.exceptions.RepositoryAlreadyExistsException:
+            _log("✅ ECR repository already exists")
+            return self._sync_lifecycle_policy(lifecycle_policy_text, lifecycle_policy_digest)
+        except Exception as e:
+            _log(f"❌ Failed to create ECR repository: {e}")
+            return False
+        
+        try:
+            self.ecr_client.put_lifecycle_policy(
+                repositoryName=self.repo_name,
+                lifecyclePolicyText=lifecycle_policy_text
             )
             
-            # Set lifecycle policy to manage image retention
-            lifecycle_policy = {
-                "rules": [
-                    {
-                        "rulePriority": 1,
-                        "description": "Keep last 10 images",
-                        "selection": {
-                            "tagStatus": "tagged",
-                            "tagPrefixList": ["latest"],
-                            "countType": "imageCountMoreThan",
-                            "countNumber": 10
-                        },
-                        "action": {
-                            "type": "expire"
-                        }
-                    }
-                ]
-            }
+            _log("✅ ECR repository created with lifecycle policy")
+            return True
+            
+        except Exception as e:
+            _log(f"❌ Failed to set ECR lifecycle policy: {e}")
+            return False
+    
+    def _sync_lifecycle_policy(self, lifecycle_policy_text, lifecycle_policy_digest):
+        """Re-apply the lifecycle policy to an existing repository if its digest tag differs
+
+        Best effort: the repository is usable either way, so missing tag or
+        lifecycle permissions only produce a warning.
+        """
+        repository_arn = f"arn:aws:ecr:{self.aws_region}:{self.aws_account_id}:repository/{self.repo_name}"
+        
+        try:
+            tags = self.ecr_client.list_tags_for_resource(resourceArn=repository_arn)['tags']
+            if {'Key': 'LifecyclePolicySha256', 'Value': lifecycle_policy_digest} in tags:
+                return True
             
             self.ecr_client.put_lifecycle_policy(
                 repositoryName=self.repo_name,
-                lifecyclePolicyText=json.dumps(lifecycle_policy)
+                lifecyclePolicyText=lifecycle_policy_text
+            )
+            self.ecr_client.tag_resource(
+                resourceArn=repository_arn,
+                tags=[{'Key': 'LifecyclePolicySha256', 'Value': lifecycle_policy_digest}]
             )
             
-            print("✅ ECR repository created with lifecycle policy")
-            return True
+            _log("✅ ECR lifecycle policy updated")
             
         except Exception as e:
-            print(f"❌ Failed to create ECR repository: {e}")
+            _log(f"⚠️ Could not update ECR lifecycle policy: {e}")
+        
+        return True
+    
+    def start_base_image_pull(self, dockerfile='Dockerfile.main'):
+        """Start pulling the Dockerfile base image in the background"""
+        try:
+            with open(dockerfile, 'r') as f:
+                match = _FROM_RE.search(f.read())
+        except OSError:
+            return
+        
+        if not match:
+            return
+        
+        base_image = match.group(1)
+        try:
+            self._base_image_pull = subprocess.Popen(
+                ['docker', 'pull', '--platform', 'linux/arm64', base_image],
+                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+            )
+            _log(f"⏬ Pre-pulling base image in background: {base_image}")
+        except FileNotFoundError:
+            self._base_image_pull = None
+    
+    def stop_base_image_pull(self):
+        """Terminate and reap the background base image pull, if still running"""
+        if self._base_image_pull is None:
+            return
+        
+        if self._base_image_pull.poll() is None:
+            self._base_image_pull.terminate()
+        self._base_image_pull.wait()
+        self._base_image_pull = None
+    
+    def reuse_cached_image(self):
+        """Point `latest` at an existing image built from identical inputs, if any"""
+        try:
+            self.ecr_client.describe_images(
+                repositoryName=self.repo_name,
+                imageIds=[{'imageTag': self.cache_tag}]
+            )
+        except self.ecr_client.exceptions.ImageNotFoundException:
+            return False
+        except Exception as e:
+            _log(f"⚠️ Could not check for cached image: {e}")
+            return False
+        
+        try:
+            # Server-side retag: no layers are transferred
+            images = self.ecr_client.batch_get_image(
+                repositoryName=self.repo_name,
+                imageIds=[{'imageTag': self.cache_tag}]
+            )['images']
+            self.ecr_client.put_image(
+                repositoryName=self.repo_name,
+                imageManifest=images[0]['imageManifest'],
+                imageTag=self.image_tag
+            )
+        except self.ecr_client.exceptions.ImageAlreadyExistsException:
+            pass
+        except Exception as e:
+            _log(f"⚠️ Could not retag cached image: {e}")
             return False
+        
+        _log(f"✅ Reusing cached image {self.cache_tag} - skipping build and push")
+        return True
     
     def build_docker_image(self):
-        """Build Docker image with AgentCore enhancements"""
-        print(f"\n🔨 Building Docker Image...")
+        """Build Docker image with AgentCore enhancements and push it to ECR"""
+        _log(f"\n🔨 Building and Pushing Docker Image...")
         
         try:
+            # Wait for the base image pre-pull so the build finds it locally
+            if self._base_image_pull is not None:
+                self._base_image_pull.wait()
+                self._base_image_pull = None
+            
             # Build command with enhanced build args
+            # BuildKit pushes straight to ECR with multi-threaded zstd layer compression
             build_cmd = [
-                'docker', 'build',
+                'docker', 'buildx', 'build',
+                '--pull=false',
                 '-f', 'Dockerfile.main',
                 '-t', self.image_uri,
+                '-t', self.cache_image_uri,
                 '--build-arg', f'AWS_REGION={self.aws_region}',
                 '--build-arg', f'MODEL_PROVIDER=gemini',
                 '--build-arg', f'GEMINI_MODEL_ID=gemini-2.5-pro',
                 '--platform', 'linux/arm64',
+                '--output', 'type=image,push=true,compression=zstd,compression-level=3,force-compression=true',
                 '.'
             ]
             
-            print(f"Build command: {' '.join(build_cmd)}")
+            _log(f"Build command: {' '.join(build_cmd)}")
             
             # Execute build
             result = subprocess.run(build_cmd, capture_output=True, text=True)
             
             if result.returncode == 0:
-                print("✅ Docker image built successfully")
-                print(f"Image URI: {self.image_uri}")
+                _log("✅ Docker image built and pushed to ECR successfully", f"Image URI: {self.image_uri}")
                 return True
             else:
-                print(f"❌ Docker build failed:")
-                print(f"STDOUT: {result.stdout}")
-                print(f"STDERR: {result.stderr}")
+                _log(
+                    "❌ Docker build failed:",
+                    f"STDOUT: {result.stdout}",
+                    f"STDERR: {result.stderr}"
+                )
                 return False
                 
         except Exception as e:
-            print(f"❌ Failed to build Docker image: {e}")
+            _log(f"❌ Failed to build Docker image: {e}")
             return False
     
-    def push_to_ecr(self):
-        """Push Docker image to ECR"""
-        print(f"\n📤 Pushing to ECR...")
+    def login_to_ecr(self):
+        """Log Docker into ECR so BuildKit can push directly"""
+        _log(f"\n🔑 Logging into ECR...")
         
         try:
             # Get ECR login token
@@ -216,36 +393,26 @@ class PropertyPilotAgentCoreBuilder:
             login_result = login_process.communicate(input=password)
             
             if login_process.returncode != 0:
-                print(f"❌ ECR login failed: {login_result[1]}")
+                _log(f"❌ ECR login failed: {login_result[1]}")
                 return False
             
-            print("✅ Logged into ECR")
-            
-            # Push image
-            push_cmd = ['docker', 'push', self.image_uri]
-            push_result = subprocess.run(push_cmd, capture_output=True, text=True)
-            
-            if push_result.returncode == 0:
-                print("✅ Image pushed to ECR successfully")
-                return True
-            else:
-                print(f"❌ Push failed: {push_result.stderr}")
-                return False
+            _log("✅ Logged into ECR")
+            return True
                 
         except Exception as e:
-            print(f"❌ Failed to push to ECR: {e}")
+            _log(f"❌ Failed to log into ECR: {e}")
             return False
     
     def create_iam_role_with_agentcore_permissions(self):
         """Create IAM role with comprehensive AgentCore permissions"""
-        print(f"\n🔐 Creating IAM Role with AgentCore Permissions...")
+        _log(f"\n🔐 Creating IAM Role with AgentCore Permissions...")
         
         role_name = "PropertyPilotAgentCoreEnhancedRole"
         
         try:
             # Check if role exists
             self.iam_client.get_role(RoleName=role_name)
-            print(f"✅ IAM role {role_name} already exists")
+            _log(f"✅ IAM role {role_name} already exists")
             return f"arn:aws:iam::{self.aws_account_id}:role/{role_name}"
         except self.iam_client.exceptions.NoSuchEntityException:
             pass
@@ -271,7 +438,7 @@ class PropertyPilotAgentCoreBuilder:
             # Create role
             role_response = self.iam_client.create_role(
                 RoleName=role_name,
-                AssumeRolePolicyDocument=json.dumps(trust_policy),
+                AssumeRolePolicyDocument=_json_dumps(trust_policy),
                 Description="Enhanced IAM role for PropertyPilot AgentCore with full capabilities",
                 Tags=[
                     {'Key': 'Application', 'Value': 'PropertyPilot'},
@@ -345,7 +512,7 @@ class PropertyPilotAgentCoreBuilder:
             self.iam_client.put_role_policy(
                 RoleName=role_name,
                 PolicyName='PropertyPilotAgentCorePolicy',
-                PolicyDocument=json.dumps(agentcore_policy)
+                PolicyDocument=_json_dumps(agentcore_policy)
             )
             
             # Attach AWS managed policies
@@ -361,33 +528,31 @@ class PropertyPilotAgentCoreBuilder:
                         PolicyArn=policy_arn
                     )
                 except Exception as e:
-                    print(f"⚠️ Warning: Could not attach {policy_arn}: {e}")
+                    _log(f"⚠️ Warning: Could not attach {policy_arn}: {e}")
             
-            print(f"✅ Created IAM role with comprehensive permissions")
+            _log(f"✅ Created IAM role with comprehensive permissions")
             return role_response['Role']['Arn']
             
         except Exception as e:
-            print(f"❌ Failed to create IAM role: {e}")
+            _log(f"❌ Failed to create IAM role: {e}")
             return None
     
     def deploy_to_agentcore(self, role_arn):
         """Deploy to AgentCore with full capabilities"""
-        print(f"\n🚀 Deploying to AgentCore...")
+        _log(f"\n🚀 Deploying to AgentCore...")
         
         runtime_name = f"PropertyPilotGeminiEnhanced"
         
-        # Load AgentCore configuration
-        with open('agentcore_config.json', 'r') as f:
-            config = json.load(f)
+        config = self._config
         
         # Environment variables from config
-        env_vars = config['agentcore']['runtime_configuration']['environment_variables'].copy()
-        env_vars.update({
+        env_vars = {
+            **config['agentcore']['runtime_configuration']['environment_variables'],
             'AWS_REGION': self.aws_region,
             'GEMINI_API_KEY': os.getenv('GEMINI_API_KEY', ''),
             'HASDATA_API_KEY': os.getenv('HASDATA_API_KEY', ''),
-            'AGENTCORE_CONFIG': json.dumps(config)
-        })
+            'AGENTCORE_CONFIG': self._config_blob
+        }
         
         # Simplified runtime configuration based on actual API
         runtime_config = {
@@ -409,10 +574,18 @@ class PropertyPilotAgentCoreBuilder:
         try:
             response = self.bedrock_client.create_agent_runtime(**runtime_config)
             
-            print(f"✅ AgentCore Runtime Created Successfully!")
-            print(f"   Runtime Name: {runtime_name}")
-            print(f"   Runtime ARN: {response['agentRuntimeArn']}")
-            print(f"   Status: {response['status']}")
+            _log(f"⏳ Waiting for runtime to become ready (status: {response['status']})...")
+            status = self._wait_for_runtime(response['agentRuntimeId'])
+            if status != 'READY':
+                _log(f"❌ AgentCore runtime did not become ready: {status}")
+                return None
+            
+            _log(
+                "✅ AgentCore Runtime Created Successfully!",
+                f"   Runtime Name: {runtime_name}",
+                f"   Runtime ARN: {response['agentRuntimeArn']}",
+                f"   Status: {status}"
+            )
             
             # Save deployment information
             deployment_info = {
@@ -423,72 +596,98 @@ class PropertyPilotAgentCoreBuilder:
                 'role_arn': role_arn,
                 'aws_region': self.aws_region,
                 'aws_account_id': self.aws_account_id,
-                'status': response['status'],
+                'status': status,
                 'capabilities': config['agentcore']['capabilities'],
                 'model_configuration': config['model_configuration']
             }
             
             with open('agentcore_deployment_info.json', 'w') as f:
-                json.dump(deployment_info, f, indent=2)
+                f.write(_json_dumps(deployment_info, indent=True))
             
-            print(f"📊 Deployment info saved to: agentcore_deployment_info.json")
+            _log(f"📊 Deployment info saved to: agentcore_deployment_info.json")
             
             return response
             
         except Exception as e:
-            print(f"❌ Failed to deploy to AgentCore: {e}")
+            _log(f"❌ Failed to deploy to AgentCore: {e}")
             return None
     
+    def _wait_for_runtime(self, runtime_id, max_attempts=20):
+        """Wait for an AgentCore runtime to leave its transitional state"""
+        if 'agent_runtime_available' in self.bedrock_client.waiter_names:
+            self.bedrock_client.get_waiter('agent_runtime_available').wait(agentRuntimeId=runtime_id)
+            return 'READY'
+        
+        status = None
+        for attempt in range(max_attempts):
+            status = self.bedrock_client.get_agent_runtime(agentRuntimeId=runtime_id)['status']
+            if status not in ('CREATING', 'UPDATING'):
+                return status
+            time.sleep(min(30, 2 ** attempt + random.random()))
+        
+        return status
+    
     def run_full_deployment(self):
         """Run complete deployment process"""
-        print("🏠 PropertyPilot AgentCore Full Deployment")
-        print("=" * 60)
+        _log("🏠 PropertyPilot AgentCore Full Deployment", "=" * 60)
         
         # Step 1: Check prerequisites
         if not self.check_prerequisites():
-            print("❌ Prerequisites not met. Please fix the issues above.")
-            return False
-        
-        # Step 2: Create ECR repository
-        if not self.create_ecr_repository():
-            print("❌ Failed to create ECR repository.")
-            return False
-        
-        # Step 3: Build Docker image
-        if not self.build_docker_image():
-            print("❌ Failed to build Docker image.")
-            return False
-        
-        # Step 4: Push to ECR
-        if not self.push_to_ecr():
-            print("❌ Failed to push to ECR.")
-            return False
-        
-        # Step 5: Create IAM role
-        role_arn = self.create_iam_role_with_agentcore_permissions()
-        if not role_arn:
-            print("❌ Failed to create IAM role.")
+            _log("❌ Prerequisites not met. Please fix the issues above.")
             return False
         
-        # Step 6: Deploy to AgentCore
-        deployment_result = self.deploy_to_agentcore(role_arn)
-        if not deployment_result:
-            print("❌ Failed to deploy to AgentCore.")
-            return False
-        
-        print("\n🎉 PropertyPilot Successfully Deployed to AgentCore!")
-        print("=" * 60)
-        print("Your AI-powered real estate investment system is now running with:")
-        print("✅ Google Gemini 2.5 Pro AI model")
-        print("✅ Full AgentCore capabilities (Memory, Observability, Identity)")
-        print("✅ Built-in real estate analysis tools")
-        print("✅ Scalable AWS infrastructure")
-        print("✅ Enterprise-grade security")
-        print("")
-        print(f"🔗 Runtime ARN: {deployment_result['agentRuntimeArn']}")
-        print(f"📊 Monitor at: https://console.aws.amazon.com/bedrock/home?region={self.aws_region}#/agentcore")
+        # Overlap the base image pull with ECR setup
+        self.start_base_image_pull()
         
-        return True
+        try:
+            # Step 2: Create ECR repository
+            if not self.create_ecr_repository():
+                _log("❌ Failed to create ECR repository.")
+                return False
+            
+            # Steps 3-4: Build and push, unless an image with identical inputs exists
+            if not self.reuse_cached_image():
+                # Step 3: Log into ECR
+                if not self.login_to_ecr():
+                    _log("❌ Failed to log into ECR.")
+                    return False
+                
+                # Step 4: Build Docker image and push to ECR
+                if not self.build_docker_image():
+                    _log("❌ Failed to build and push Docker image.")
+                    return False
+            
+            # Step 5: Create IAM role
+            role_arn = self.create_iam_role_with_agentcore_permissions()
+            if not role_arn:
+                _log("❌ Failed to create IAM role.")
+                return False
+            
+            # Step 6: Deploy to AgentCore
+            deployment_result = self.deploy_to_agentcore(role_arn)
+            if not deployment_result:
+                _log("❌ Failed to deploy to AgentCore.")
+                return False
+            
+            _log(
+                "\n🎉 PropertyPilot Successfully Deployed to AgentCore!",
+                "=" * 60,
+                "Your AI-powered real estate investment system is now running with:",
+                "✅ Google Gemini 2.5 Pro AI model",
+                "✅ Full AgentCore capabilities (Memory, Observability, Identity)",
+                "✅ Built-in real estate analysis tools",
+                "✅ Scalable AWS infrastructure",
+                "✅ Enterprise-grade security",
+                "",
+                f"🔗 Runtime ARN: {deployment_result['agentRuntimeArn']}",
+                f"📊 Monitor at: https://console.aws.amazon.com/bedrock/home?region={self.aws_region}#/agentcore"
+            )
+            
+            return True
+        finally:
+            # A cache hit or a failed step never reaches the build's wait, so
+            # don't leave the pull running after the script exits
+            self.stop_base_image_pull()
 
 def main():
     """Main deployment function"""
@@ -496,10 +695,10 @@ def main():
     success = builder.run_full_deployment()
     
     if not success:
-        print("\n❌ Deployment failed. Please check the logs above.")
+        _log("\n❌ Deployment failed. Please check the logs above.")
         exit(1)
     
-    print("\n🚀 Ready to analyze real estate investments with AI!")
+    _log("\n🚀 Ready to analyze real estate investments with AI!")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -5,12 +5,74 @@ Update the API backend to use your existing AgentCore deployment
 """
 
 import os
+import re
+import ast
+import functools
 import json
+import hashlib
+import mmap
+import platform
+import shutil
 import subprocess
 import sys
+import tempfile
+import zipfile
 import boto3
+import requests
+from boto3.s3.transfer import TransferConfig
+from concurrent.futures import ThreadPoolExecutor, wait
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Lambda package compression, selected with PROPERTYPILOT_ZIP_COMPRESS:
+# "stored" skips DEFLATE entirely (CI), "fast" and "best" trade build time for size
+ZIP_COMPRESSION_MODES = {
+    'stored': (zipfile.ZIP_STORED, None),
+    'fast': (zipfile.ZIP_DEFLATED, 1),
+    'best': (zipfile.ZIP_DEFLATED, 9)
+}
+
+MANGUM_REQUIREMENT = "mangum==0.17.0"
+
+# Never needed at runtime in Lambda: bytecode caches, dependency test suites,
+# docs/examples, debug symbols and wheel RECORD manifests
+PACKAGE_SKIP_DIRS = {'__pycache__', 'tests', 'test', 'examples', 'docs'}
+PACKAGE_SKIP_SUFFIXES = ('.pyc', '.pyo', '.so.debug')
+
+# Lambda tag recording the fingerprint of the deployed package
+PACKAGE_FINGERPRINT_TAG = 'PackageFingerprint'
+
+# Dependency-only "seed" zips are cached here across deploys
+SEED_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'propertypilot')
+
+_ENDPOINT_RE = re.compile(
+    r'bedrock-agentcore\.(?P<region>[^.]+)\.amazonaws\.com/runtimes/(?P<runtime_id>[^/?#]+)'
+)
+
+# One botocore session for the whole run, so credentials and service models
+# are resolved once and clients are shared between steps
+_SESSION = boto3.session.Session()
+_CLIENTS = {}
+
+def aws_client(service, region=None):
+    """Return the shared client for a service/region pair, creating it on first use"""
+    key = (service, region)
+    if key not in _CLIENTS:
+        _CLIENTS[key] = _SESSION.client(service, region_name=region)
+    return _CLIENTS[key]
+
+# Multipart settings for uploading the Lambda package to S3
+S3_TRANSFER_CONFIG = TransferConfig(multipart_threshold=8 * 1024 * 1024, max_concurrency=10)
+
+API_ENDPOINT_PLACEHOLDER = b"const API_ENDPOINT = '/api/v1/analyze';  // Will be updated with actual API URL after deployment"
+
+# Parsed config files keyed on (path, mtime_ns, size)
+_CONFIG_CACHE = {}
+
 def print_header(title):
     """Print a formatted header"""
     print("\n" + "=" * 60)
@@ -22,6 +84,116 @@ def print_step(step, description):
     print(f"\n📋 Step {step}: {description}")
     print("-" * 40)
 
+# Files at least this large are memory-mapped instead of read into a bytes copy
+MMAP_THRESHOLD = 256 * 1024
+
+def _read_file(path):
+    """Return a file's contents as bytes, or as a read-only mmap for large files"""
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size >= MMAP_THRESHOLD:
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return f.read()
+
+def write_zip_entries(zipf, entries, batch_size=256):
+    """Write (file_path, arcname) pairs to zipf, reading files in a thread pool
+
+    Reads overlap with the single writer; batching bounds how many file
+    contents are held in memory at once.
+    """
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+        for start in range(0, len(entries), batch_size):
+            batch = entries[start:start + batch_size]
+            contents = executor.map(_read_file, [file_path for file_path, _ in batch])
+            for (file_path, arcname), data in zip(batch, contents):
+                # from_file keeps the on-disk mode so Lambda can read the entry
+                zinfo = zipfile.ZipInfo.from_file(file_path, arcname)
+                zipf.writestr(zinfo, data, compress_type=zipf.compression, compresslevel=zipf.compresslevel)
+                if isinstance(data, mmap.mmap):
+                    data.close()
+
+def collect_package_entries(source_root, exclude=()):
+    """List (file_path, arcname) pairs under source_root, minus runtime-irrelevant files"""
+    entries = []
+    for root, dirs, files in os.walk(source_root):
+        # Prune in place so os.walk never descends into skipped directories
+        dirs[:] = [d for d in dirs if d not in PACKAGE_SKIP_DIRS]
+        in_dist_info = root.endswith('.dist-info')
+        for file in files:
+            if file.endswith(PACKAGE_SKIP_SUFFIXES) or (in_dist_info and file == 'RECORD'):
+                continue
+            file_path = os.path.join(root, file)
+            arcname = os.path.relpath(file_path, source_root)
+            if arcname not in exclude:
+                entries.append((file_path, arcname))
+    return entries
+
+def compute_package_fingerprint(lambda_handler_content):
+    """Content hash of everything that goes into the Lambda package"""
+    fingerprint = hashlib.blake2b(digest_size=16)
+    fingerprint.update(MANGUM_REQUIREMENT.encode())
+    fingerprint.update(lambda_handler_content.encode('utf-8'))
+    for file_path, arcname in sorted(collect_package_entries('api', exclude={'lambda_function.py'}), key=lambda e: e[1]):
+        fingerprint.update(arcname.encode('utf-8'))
+        with open(file_path, 'rb') as f:
+            fingerprint.update(hashlib.blake2b(f.read(), digest_size=16).digest())
+    return fingerprint.hexdigest()
+
+def get_dependencies_seed_zip(compress_mode):
+    """Return a cached zip of the Lambda dependencies, building it on a cache miss
+
+    The cache is keyed on api/requirements.txt, the package filters, the local
+    interpreter and platform, and the compression mode, so repeated deploys
+    skip pip and re-zipping of unchanged dependencies.
+    """
+    with open('api/requirements.txt', 'rb') as f:
+        seed_inputs = f.read() + MANGUM_REQUIREMENT.encode()
+    # Filter changes must invalidate seeds built with the old filters
+    seed_inputs += repr((sorted(PACKAGE_SKIP_DIRS), PACKAGE_SKIP_SUFFIXES)).encode()
+    # pip builds compiled wheels for the interpreter and platform running it
+    seed_inputs += repr((sys.implementation.cache_tag, platform.machine(), sys.platform)).encode()
+    requirements_hash = hashlib.sha256(seed_inputs).hexdigest()[:16]
+    
+    seed_path = os.path.join(SEED_CACHE_DIR, f'deps-{requirements_hash}-{compress_mode}.zip')
+    if os.path.exists(seed_path):
+        print(f"♻️ Reusing cached dependencies: {seed_path}")
+        return seed_path
+    
+    compression, compresslevel = ZIP_COMPRESSION_MODES[compress_mode]
+    os.makedirs(SEED_CACHE_DIR, exist_ok=True)
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        # Install dependencies (including mangum for Lambda compatibility)
+        # to the package in a single resolve; .pyc files would ship unused
+        print("📦 Installing Lambda dependencies...")
+        subprocess.run([
+            sys.executable, "-m", "pip", "install",
+            "--no-compile", "--disable-pip-version-check", "--no-input",
+            "-r", "api/requirements.txt",
+            MANGUM_REQUIREMENT,
+            "-t", temp_dir
+        ], check=True)
+        
+        # Write under a temporary name so an interrupted build never leaves a bad seed
+        partial_path = f'{seed_path}.partial'
+        with zipfile.ZipFile(partial_path, 'w', compression, compresslevel=compresslevel) as zipf:
+            write_zip_entries(zipf, collect_package_entries(temp_dir))
+        os.replace(partial_path, seed_path)
+    
+    return seed_path
+
+def load_config_file(path):
+    """Parse a JSON config file, reusing the parsed result while it is unchanged"""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    
+    cache_key = (path, stat.st_mtime_ns, stat.st_size)
+    if cache_key not in _CONFIG_CACHE:
+        with open(path, 'rb') as f:
+            _CONFIG_CACHE[cache_key] = json.loads(f.read())
+    return _CONFIG_CACHE[cache_key]
+
 def get_existing_agentcore_info():
     """Get existing AgentCore deployment information"""
     print_step(1, "Getting Existing AgentCore Information")
@@ -37,15 +209,15 @@ def get_existing_agentcore_info():
         deployment_info = None
         
         for config_file in config_files:
-            if os.path.exists(config_file):
-                with open(config_file, 'r') as f:
-                    config = json.load(f)
-                    endpoint = config.get('agentcore_endpoint') or config.get('endpoint_url')
-                    if endpoint:
-                        agentcore_endpoint = endpoint
-                        deployment_info = config
-                        print(f"✅ Found AgentCore info in {config_file}")
-                        break
+            config = load_config_file(config_file)
+            if config is None:
+                continue
+            endpoint = config.get('agentcore_endpoint') or config.get('endpoint_url')
+            if endpoint:
+                agentcore_endpoint = endpoint
+                deployment_info = config
+                print(f"✅ Found AgentCore info in {config_file}")
+                break
         
         if not agentcore_endpoint:
             print("❌ No existing AgentCore deployment found")
@@ -55,9 +227,9 @@ def get_existing_agentcore_info():
         print(f"✅ Existing AgentCore Endpoint: {agentcore_endpoint}")
         
         # Extract runtime details
-        if 'runtimes/' in agentcore_endpoint:
-            runtime_id = agentcore_endpoint.split('runtimes/')[1].split('/')[0]
-            region = agentcore_endpoint.split('bedrock-agentcore.')[1].split('.amazonaws.com')[0]
+        match = _ENDPOINT_RE.search(agentcore_endpoint)
+        if match:
+            runtime_id, region = match['runtime_id'], match['region']
             
             print(f"   Runtime ID: {runtime_id}")
             print(f"   Region: {region}")
@@ -75,6 +247,36 @@ def get_existing_agentcore_info():
         print(f"❌ Error getting AgentCore info: {e}")
         return None, None
 
+def replace_endpoint_default(source, endpoint):
+    """Set the default of `AGENTCORE_ENDPOINT = os.getenv(..., default)` in source
+
+    Locates the assignment with the ast module and splices a new literal over
+    just the default argument, so formatting and comments are untouched.
+    Returns the updated source, or None when there is nothing to change.
+    """
+    for node in ast.walk(ast.parse(source)):
+        if not (isinstance(node, ast.Assign)
+                and any(isinstance(t, ast.Name) and t.id == 'AGENTCORE_ENDPOINT' for t in node.targets)
+                and isinstance(node.value, ast.Call)
+                and len(node.value.args) >= 2
+                and isinstance(node.value.args[1], ast.Constant)):
+            continue
+        
+        default = node.value.args[1]
+        if default.value == endpoint:
+            return None
+        
+        lines = source.splitlines(keepends=True)
+        line_offsets = [0]
+        for line in lines:
+            line_offsets.append(line_offsets[-1] + len(line.encode('utf-8')))
+        encoded = source.encode('utf-8')
+        start = line_offsets[default.lineno - 1] + default.col_offset
+        end = line_offsets[default.end_lineno - 1] + default.end_col_offset
+        return (encoded[:start] + json.dumps(endpoint).encode('utf-8') + encoded[end:]).decode('utf-8')
+    
+    return None
+
 def update_api_configuration(agentcore_info):
     """Update API configuration with existing AgentCore endpoint"""
     print_step(2, "Updating API Configuration")
@@ -114,16 +316,14 @@ ALLOWED_ORIGINS=https://main.d2skoklvq312zm.amplifyapp.com,https://propertypilot
             with open(api_main_path, 'r') as f:
                 content = f.read()
             
-            # Update the default AgentCore endpoint
-            updated_content = content.replace(
-                'AGENTCORE_ENDPOINT = os.getenv(\n    "AGENTCORE_ENDPOINT",\n    "https://bedrock-agentcore.us-east-1.amazonaws.com/runtimes/PropertyPilotGeminiEnhanced-A9pB9q790m/invoke"\n)',
-                f'AGENTCORE_ENDPOINT = os.getenv(\n    "AGENTCORE_ENDPOINT",\n    "{agentcore_info["endpoint"]}"\n)'
-            )
-            
-            with open(api_main_path, 'w') as f:
-                f.write(updated_content)
-            
-            print("✅ API main.py updated with correct AgentCore endpoint")
+            updated_content = replace_endpoint_default(content, agentcore_info['endpoint'])
+            if updated_content is not None:
+                with open(api_main_path, 'w') as f:
+                    f.write(updated_content)
+                
+                print("✅ API main.py updated with correct AgentCore endpoint")
+            else:
+                print("✅ API main.py already uses the correct AgentCore endpoint")
         
         return True
         
@@ -131,17 +331,23 @@ ALLOWED_ORIGINS=https://main.d2skoklvq312zm.amplifyapp.com,https://propertypilot
         print(f"❌ Error updating API configuration: {e}")
         return False
 
+@functools.lru_cache(maxsize=1)
+def get_account_id():
+    """Return the AWS account ID of the current credentials (fixed for the process)"""
+    return aws_client('sts').get_caller_identity()['Account']
+
+def get_lambda_function(lambda_client, function_name):
+    """Return the get_function response for function_name, or None if it does not exist"""
+    try:
+        return lambda_client.get_function(FunctionName=function_name)
+    except lambda_client.exceptions.ResourceNotFoundException:
+        return None
+
 def deploy_api_to_lambda(agentcore_info):
     """Deploy the API to AWS Lambda"""
     print_step(3, "Deploying PropertyPilot API to AWS Lambda")
     
     try:
-        # Install mangum for Lambda compatibility
-        print("📦 Installing Lambda dependencies...")
-        subprocess.run([
-            sys.executable, "-m", "pip", "install", "mangum==0.17.0"
-        ], check=True)
-        
         # Create Lambda handler
         lambda_handler_content = f"""
 import os
@@ -156,73 +362,92 @@ os.environ['AWS_REGION'] = '{agentcore_info.get("region", "us-east-1")}'
 handler = Mangum(app, lifespan="off")
 """
         
-        with open('api/lambda_function.py', 'w') as f:
-            f.write(lambda_handler_content)
-        
         print("✅ Lambda handler created")
         
-        # Create deployment package
-        print("📦 Creating deployment package...")
+        region = agentcore_info.get('region', 'us-east-1')
+        lambda_client = aws_client('lambda', region)
         
-        # Create temp directory for package
-        import tempfile
-        import shutil
-        import zipfile
+        function_name = 'PropertyPilot-API'
         
-        with tempfile.TemporaryDirectory() as temp_dir:
-            # Copy API files
-            shutil.copytree('api', f'{temp_dir}/api')
+        # Look up the existing function while the package is fingerprinted,
+        # and the account ID while it is fingerprinted and built. Packaging
+        # itself waits on the function lookup, so an unchanged package is
+        # never built
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            function_future = executor.submit(get_lambda_function, lambda_client, function_name)
+            account_future = executor.submit(get_account_id)
             
-            # Install dependencies to package
-            subprocess.run([
-                sys.executable, "-m", "pip", "install", 
-                "-r", "api/requirements.txt", 
-                "mangum==0.17.0",
-                "-t", temp_dir
-            ], check=True)
+            # Skip packaging and upload entirely when nothing has changed
+            fingerprint = compute_package_fingerprint(lambda_handler_content)
+            existing_function = function_future.result()
+            if existing_function is not None and \
+                    existing_function.get('Tags', {}).get(PACKAGE_FINGERPRINT_TAG) == fingerprint:
+                function_arn = existing_function['Configuration']['FunctionArn']
+                print("✅ Lambda package unchanged - skipping upload")
+                print(f"   Function ARN: {function_arn}")
+                return function_arn
             
-            # Copy main files to root of package
-            shutil.copy('api/main.py', temp_dir)
-            shutil.copy('api/lambda_function.py', temp_dir)
+            # Create deployment package
+            print("📦 Creating deployment package...")
             
-            # Create ZIP file
             zip_path = 'propertypilot-api.zip'
-            with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-                for root, dirs, files in os.walk(temp_dir):
-                    for file in files:
-                        file_path = os.path.join(root, file)
-                        arcname = os.path.relpath(file_path, temp_dir)
-                        zipf.write(file_path, arcname)
-        
-        print(f"✅ Deployment package created: {zip_path}")
+            compress_mode = os.getenv('PROPERTYPILOT_ZIP_COMPRESS', 'stored')
+            if compress_mode not in ZIP_COMPRESSION_MODES:
+                compress_mode = 'stored'
+            compression, compresslevel = ZIP_COMPRESSION_MODES[compress_mode]
+            
+            # Start from the cached dependencies-only zip, building it on a miss
+            seed_path = get_dependencies_seed_zip(compress_mode)
+            shutil.copy(seed_path, zip_path)
+            
+            with zipfile.ZipFile(zip_path, 'a', compression, compresslevel=compresslevel) as zipf:
+                # API source straight from api/, landing at the zip root
+                write_zip_entries(zipf, collect_package_entries('api', exclude={'lambda_function.py'}))
+                
+                # The handler is generated content, so write it from memory
+                handler_info = zipfile.ZipInfo('lambda_function.py', date_time=datetime.now().timetuple()[:6])
+                handler_info.external_attr = 0o100644 << 16
+                zipf.writestr(handler_info, lambda_handler_content, compress_type=compression, compresslevel=compresslevel)
+            
+            print(f"✅ Deployment package created: {zip_path}")
         
         # Deploy to Lambda
-        lambda_client = boto3.client('lambda', region_name=agentcore_info.get('region', 'us-east-1'))
-        
-        with open(zip_path, 'rb') as f:
-            zip_content = f.read()
-        
-        function_name = 'PropertyPilot-API'
+        # With an artifact bucket configured, upload the package to S3 with a
+        # parallel multipart upload (and no 50 MB direct-upload limit);
+        # otherwise send it inline
+        artifact_bucket = os.getenv('PROPERTYPILOT_ARTIFACT_BUCKET')
+        if artifact_bucket:
+            s3_key = f'lambda/{function_name}/{os.path.basename(zip_path)}'
+            s3_client = aws_client('s3', region)
+            s3_client.upload_file(zip_path, artifact_bucket, s3_key, Config=S3_TRANSFER_CONFIG)
+            print(f"✅ Deployment package uploaded to s3://{artifact_bucket}/{s3_key}")
+            code_location = {'S3Bucket': artifact_bucket, 'S3Key': s3_key}
+        else:
+            with open(zip_path, 'rb') as f:
+                code_location = {'ZipFile': f.read()}
         
-        try:
-            # Try to update existing function
+        if existing_function is not None:
+            # Update existing function
             response = lambda_client.update_function_code(
                 FunctionName=function_name,
-                ZipFile=zip_content
+                Publish=False,
+                **code_location
+            )
+            lambda_client.tag_resource(
+                Resource=response['FunctionArn'],
+                Tags={PACKAGE_FINGERPRINT_TAG: fingerprint}
             )
             print("✅ Lambda function updated successfully")
-        except lambda_client.exceptions.ResourceNotFoundException:
-            # Create new function
-            # Get account ID for IAM role
-            sts_client = boto3.client('sts')
-            account_id = sts_client.get_caller_identity()['Account']
+        else:
+            # Create new function, using the account ID for the IAM role
+            account_id = account_future.result()
             
             response = lambda_client.create_function(
                 FunctionName=function_name,
                 Runtime='python3.11',
                 Role=f'arn:aws:iam::{account_id}:role/lambda-execution-role',
                 Handler='lambda_function.handler',
-                Code={'ZipFile': zip_content},
+                Code=code_location,
                 Description='PropertyPilot Real Estate Investment API',
                 Timeout=300,
                 MemorySize=1024,
@@ -232,7 +457,8 @@ handler = Mangum(app, lifespan="off")
                         'AWS_REGION': agentcore_info.get('region', 'us-east-1'),
                         'LOG_LEVEL': 'INFO'
                     }
-                }
+                },
+                Tags={PACKAGE_FINGERPRINT_TAG: fingerprint}
             )
             print("✅ Lambda function created successfully")
         
@@ -253,8 +479,8 @@ def create_api_gateway(lambda_arn, region):
     print_step(4, "Creating API Gateway")
     
     try:
-        apigateway = boto3.client('apigatewayv2', region_name=region)
-        lambda_client = boto3.client('lambda', region_name=region)
+        apigateway = aws_client('apigatewayv2', region)
+        lambda_client = aws_client('lambda', region)
         
         # Create HTTP API
         api_response = apigateway.create_api(
@@ -296,39 +522,52 @@ def create_api_gateway(lambda_arn, region):
             'GET /redoc'
         ]
         
-        for route in routes:
-            apigateway.create_route(
+        # Plus a catch-all route
+        routes.append('ANY /{proxy+}')
+        
+        def create_route(route):
+            try:
+                apigateway.create_route(
+                    ApiId=api_id,
+                    RouteKey=route,
+                    Target=f'integrations/{integration_id}'
+                )
+            except apigateway.exceptions.ConflictException:
+                # Route already exists
+                pass
+        
+        def create_default_stage():
+            apigateway.create_stage(
                 ApiId=api_id,
-                RouteKey=route,
-                Target=f'integrations/{integration_id}'
+                StageName='$default',
+                AutoDeploy=True
             )
         
-        # Create catch-all route
-        apigateway.create_route(
-            ApiId=api_id,
-            RouteKey='ANY /{proxy+}',
-            Target=f'integrations/{integration_id}'
-        )
-        
-        # Create default stage
-        apigateway.create_stage(
-            ApiId=api_id,
-            StageName='$default',
-            AutoDeploy=True
-        )
-        
-        # Add Lambda permission for API Gateway
-        try:
-            lambda_client.add_permission(
-                FunctionName=lambda_arn,
-                StatementId='api-gateway-invoke',
-                Action='lambda:InvokeFunction',
-                Principal='apigateway.amazonaws.com',
-                SourceArn=f"arn:aws:execute-api:{region}:*:{api_id}/*/*"
-            )
-        except lambda_client.exceptions.ResourceConflictException:
-            # Permission already exists
-            pass
+        def add_invoke_permission():
+            # Add Lambda permission for API Gateway
+            try:
+                lambda_client.add_permission(
+                    FunctionName=lambda_arn,
+                    StatementId='api-gateway-invoke',
+                    Action='lambda:InvokeFunction',
+                    Principal='apigateway.amazonaws.com',
+                    SourceArn=f"arn:aws:execute-api:{region}:*:{api_id}/*/*"
+                )
+            except lambda_client.exceptions.ResourceConflictException:
+                # Permission already exists
+                pass
+        
+        # Routes, the default stage and the invoke permission only depend on
+        # the API and integration, so create them all concurrently
+        with ThreadPoolExecutor(max_workers=len(routes) + 2) as executor:
+            futures = [executor.submit(create_route, route) for route in routes]
+            futures.append(executor.submit(create_default_stage))
+            futures.append(executor.submit(add_invoke_permission))
+            wait(futures)
+        
+        # Surface the first failure, if any
+        for future in futures:
+            future.result()
         
         print(f"✅ API Gateway configured with Lambda integration")
         
@@ -343,25 +582,24 @@ def update_frontend_with_api(api_endpoint):
     print_step(5, "Updating Frontend with API Endpoint")
     
     try:
-        # Read current index.html
-        with open('index.html', 'r', encoding='utf-8') as f:
+        # Splice the API endpoint into index.html as bytes - the placeholder
+        # occurs once, so stop at the first match and skip decode/encode
+        with open('index.html', 'rb') as f:
             content = f.read()
         
-        # Update API endpoint
-        updated_content = content.replace(
-            "const API_ENDPOINT = '/api/v1/analyze';  // Will be updated with actual API URL after deployment",
-            f"const API_ENDPOINT = '{api_endpoint}/api/v1/analyze';"
-        )
-        
-        # Write updated content
-        with open('index.html', 'w', encoding='utf-8') as f:
-            f.write(updated_content)
+        offset = content.find(API_ENDPOINT_PLACEHOLDER)
+        if offset >= 0:
+            replacement = f"const API_ENDPOINT = '{api_endpoint}/api/v1/analyze';".encode('utf-8')
+            with open('index.html', 'wb') as f:
+                f.write(content[:offset])
+                f.write(replacement)
+                f.write(content[offset + len(API_ENDPOINT_PLACEHOLDER):])
         
         print("✅ Frontend updated with API endpoint")
         
-        # Commit and push changes
-        subprocess.run(['git', 'add', '.'], check=True)
-        subprocess.run(['git', 'commit', '-m', f'Connect to PropertyPilot API: {api_endpoint}'], check=True)
+        # Commit and push changes; -a stages the tracked edits (index.html and
+        # the api/main.py endpoint) without a separate `git add` process
+        subprocess.run(['git', 'commit', '-am', f'Connect to PropertyPilot API: {api_endpoint}'], check=True)
         subprocess.run(['git', 'push'], check=True)
         
         print("✅ Changes pushed to GitHub (Amplify will auto-deploy)")
@@ -377,19 +615,6 @@ def test_complete_integration(api_endpoint, agentcore_info):
     print_step(6, "Testing Complete Integration")
     
     try:
-        import requests
-        
-        # Test API health
-        print("🔍 Testing API health...")
-        health_response = requests.get(f"{api_endpoint}/health", timeout=10)
-        
-        if health_response.status_code == 200:
-            print("✅ API health check passed")
-        else:
-            print(f"⚠️ API health check failed: {health_response.status_code}")
-        
-        # Test analysis endpoint
-        print("🔍 Testing analysis endpoint...")
         test_payload = {
             "query": "Test PropertyPilot integration for Austin, TX",
             "location": "Austin, TX",
@@ -398,11 +623,24 @@ def test_complete_integration(api_endpoint, agentcore_info):
             "analysis_type": "enhanced_analysis"
         }
         
-        analysis_response = requests.post(
-            f"{api_endpoint}/api/v1/analyze",
-            json=test_payload,
-            timeout=60
-        )
+        # Run the health check while the analysis request is in flight, over
+        # one pooled keep-alive session
+        print("🔍 Testing API health and analysis endpoint...")
+        with requests.Session() as session, ThreadPoolExecutor(max_workers=2) as executor:
+            health_future = executor.submit(session.get, f"{api_endpoint}/health", timeout=10)
+            analysis_future = executor.submit(
+                session.post,
+                f"{api_endpoint}/api/v1/analyze",
+                json=test_payload,
+                timeout=60
+            )
+            health_response = health_future.result()
+            analysis_response = analysis_future.result()
+        
+        if health_response.status_code == 200:
+            print("✅ API health check passed")
+        else:
+            print(f"⚠️ API health check failed: {health_response.status_code}")
         
         if analysis_response.status_code == 200:
             result = analysis_response.json()
@@ -449,8 +687,12 @@ def create_deployment_summary(api_endpoint, agentcore_info):
         ]
     }
     
-    with open('api_deployment_summary.json', 'w') as f:
-        json.dump(summary, f, indent=2)
+    if orjson is not None:
+        with open('api_deployment_summary.json', 'wb') as f:
+            f.write(orjson.dumps(summary, option=orjson.OPT_INDENT_2))
+    else:
+        with open('api_deployment_summary.json', 'w') as f:
+            json.dump(summary, f, indent=2)
     
     print("✅ Deployment summary saved to api_deployment_summary.json")
     
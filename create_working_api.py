@@ -8,12 +8,60 @@ import boto3
 import json
 import zipfile
 import tempfile
+import time
 import os
 
+# Shared session and client, created once per process
+_SESSION = boto3.session.Session()
+_LAMBDA = None
+
+def get_lambda_client():
+    """Return the process-wide Lambda client, creating it on first use"""
+    global _LAMBDA
+    if _LAMBDA is None:
+        _LAMBDA = _SESSION.client('lambda')
+    return _LAMBDA
+
 def create_minimal_lambda():
     """Create minimal working Lambda function"""
     
-    lambda_code = '''import json
+    lambda_code = '''import base64
+import json
+import re
+
+# Analysis response pre-serialized at cold start; only the placeholders are
+# filled per request. "@@NAME@@" in quotes is a whole JSON value, a bare
+# @@NAME@@ sits inside a string.
+_ANALYSIS_TEMPLATE = json.dumps({
+    'success': True,
+    'message': 'Investment analysis completed for @@LOCATION@@',
+    'analysis_id': 'mock-analysis-123',
+    'timestamp': '2025-10-27T18:30:00Z',
+    'location': '@@LOCATION_VALUE@@',
+    'analysis_type': '@@ANALYSIS_TYPE@@',
+    'processing_time': 2.1,
+    'confidence_score': 0.85,
+    'results': {
+        'summary': 'PropertyPilot AI has analyzed investment opportunities in @@LOCATION@@. Based on current market conditions, property values, and rental potential, here are the key findings for your investment query: "@@QUERY@@"',
+        'analysis_data': {
+            'enhanced_analysis': 'Market Analysis for @@LOCATION@@: The real estate market shows positive indicators for investment. Property values have shown steady growth, and rental demand remains strong. Key factors include location desirability, economic growth, and infrastructure development.',
+            'property_analysis': 'Financial Analysis: Based on your budget and criteria, several properties in @@LOCATION@@ show strong ROI potential. Estimated rental yields range from 6-8% annually, with property appreciation expected at 3-5% per year.',
+            'market_research': 'Market Conditions in @@LOCATION@@: Current market temperature is balanced to slightly favorable for buyers. Inventory levels are moderate, and days on market average 25-35 days. This creates good opportunities for selective investors.',
+            'investment_opportunities': 'Investment Recommendations: Focus on properties in emerging neighborhoods within @@LOCATION@@. Look for properties under market value that need minor improvements. Consider both single-family homes and small multi-family properties for diversification.'
+        }
+    }
+})
+_ANALYSIS_PARTS = re.split(r'("@@[A-Z_]+@@"|@@[A-Z_]+@@)', _ANALYSIS_TEMPLATE)
+
+def render_analysis(location, query, analysis_type):
+    """Fill the pre-serialized analysis response for one request"""
+    values = {
+        '"@@LOCATION_VALUE@@"': json.dumps(location),
+        '"@@ANALYSIS_TYPE@@"': json.dumps(analysis_type),
+        '@@LOCATION@@': json.dumps(str(location))[1:-1],
+        '@@QUERY@@': json.dumps(str(query))[1:-1]
+    }
+    return ''.join(values.get(part, part) for part in _ANALYSIS_PARTS)
 
 def lambda_handler(event, context):
     """Minimal PropertyPilot API"""
@@ -72,7 +120,6 @@ def lambda_handler(event, context):
             # Parse request
             body = event.get('body', '{}')
             if event.get('isBase64Encoded'):
-                import base64
                 body = base64.b64decode(body).decode('utf-8')
             
             request_data = json.loads(body)
@@ -82,30 +129,10 @@ def lambda_handler(event, context):
             query = request_data.get('query', 'Property analysis')
             
             # Mock response (replace with actual AgentCore call later)
-            response_data = {
-                'success': True,
-                'message': f'Investment analysis completed for {location}',
-                'analysis_id': 'mock-analysis-123',
-                'timestamp': '2025-10-27T18:30:00Z',
-                'location': location,
-                'analysis_type': request_data.get('analysis_type', 'enhanced_analysis'),
-                'processing_time': 2.1,
-                'confidence_score': 0.85,
-                'results': {
-                    'summary': f'PropertyPilot AI has analyzed investment opportunities in {location}. Based on current market conditions, property values, and rental potential, here are the key findings for your investment query: "{query}"',
-                    'analysis_data': {
-                        'enhanced_analysis': f'Market Analysis for {location}: The real estate market shows positive indicators for investment. Property values have shown steady growth, and rental demand remains strong. Key factors include location desirability, economic growth, and infrastructure development.',
-                        'property_analysis': f'Financial Analysis: Based on your budget and criteria, several properties in {location} show strong ROI potential. Estimated rental yields range from 6-8% annually, with property appreciation expected at 3-5% per year.',
-                        'market_research': f'Market Conditions in {location}: Current market temperature is balanced to slightly favorable for buyers. Inventory levels are moderate, and days on market average 25-35 days. This creates good opportunities for selective investors.',
-                        'investment_opportunities': f'Investment Recommendations: Focus on properties in emerging neighborhoods within {location}. Look for properties under market value that need minor improvements. Consider both single-family homes and small multi-family properties for diversification.'
-                    }
-                }
-            }
-            
             return {
                 'statusCode': 200,
                 'headers': headers,
-                'body': json.dumps(response_data)
+                'body': render_analysis(location, query, request_data.get('analysis_type', 'enhanced_analysis'))
             }
             
         except Exception as e:
@@ -134,7 +161,7 @@ def deploy_minimal_api():
     print("🚀 Deploying minimal working PropertyPilot API...")
     
     try:
-        lambda_client = boto3.client('lambda')
+        lambda_client = get_lambda_client()
         
         # Create code
         lambda_code = create_minimal_lambda()
@@ -162,7 +189,6 @@ def deploy_minimal_api():
         print("✅ Minimal API deployed successfully")
         
         # Wait for deployment
-        import time
         time.sleep(5)
         
         return True
@@ -6,13 +6,54 @@ Automated deployment of PropertyPilot real estate investment website to AWS Ampl
 
 import os
 import json
-import subprocess
+import hashlib
+import mmap
+import shutil
 import sys
 import boto3
+import requests
 import time
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from botocore.config import Config
 from botocore.exceptions import ClientError
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Files that make up the website deployment
+WEBSITE_FILES = ('index.html', 'amplify.yml')
+
+# Written after each successful deployment; its file_hashes let re-runs skip
+# uploading an unchanged website
+SUMMARY_FILE = 'amplify_deployment_summary.json'
+
+# One session and Amplify client shared by every step, so service models are
+# loaded once and HTTPS connections are kept alive between calls (TCP
+# keepalive holds the connection open across the gaps between job polls)
+_SESSION = boto3.session.Session()
+_AMPLIFY = None
+_AMPLIFY_CONFIG = Config(
+    max_pool_connections=32,
+    tcp_keepalive=True,
+    connect_timeout=3,
+    read_timeout=30,
+    retries={'max_attempts': 5, 'mode': 'adaptive'}
+)
+
+# Keep-alive HTTP pool for the presigned upload PUTs, sized like the upload pool
+_HTTP = requests.Session()
+_HTTP.mount('https://', requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=8))
+
+def amplify():
+    """Return the shared Amplify client, creating it on first use"""
+    global _AMPLIFY
+    if _AMPLIFY is None:
+        _AMPLIFY = _SESSION.client('amplify', config=_AMPLIFY_CONFIG)
+    return _AMPLIFY
+
 def print_header(title):
     """Print a formatted header"""
     print("\n" + "=" * 60)
@@ -24,63 +65,104 @@ def print_step(step, description):
     print(f"\n📋 Step {step}: {description}")
     print("-" * 40)
 
-def check_prerequisites():
+def _check_aws_cli():
+    """Return (ok message, issue) for the AWS CLI check"""
+    # A PATH lookup is enough; spawning `aws --version` costs a full CLI start
+    if shutil.which('aws'):
+        return "✅ AWS CLI available", None
+    return None, "AWS CLI not on PATH"
+
+def _check_credentials():
+    """Return (ok message, issue) for the AWS credentials check"""
+    try:
+        credentials = _SESSION.get_credentials()
+        if credentials:
+            # Resolve the provider chain now (env, profile, SSO or IMDS) so the
+            # shared session has warm credentials before the first API call
+            credentials.get_frozen_credentials()
+            return "✅ AWS credentials configured", None
+        return None, "AWS credentials not configured"
+    except Exception as e:
+        return None, f"AWS credentials error: {e}"
+
+def _check_file(file, file_status):
+    """Return (ok message, issue) for a required file"""
+    if file_status[file]:
+        return f"✅ {file} found", None
+    return None, f"Missing required file: {file}"
+
+def get_file_status():
+    """Stat each website file once; the result is shared by every step"""
+    return {name: os.path.isfile(name) for name in WEBSITE_FILES}
+
+def check_prerequisites(file_status=None):
     """Check if all prerequisites are met"""
     print_step(1, "Checking Prerequisites")
     
-    issues = []
+    if file_status is None:
+        file_status = get_file_status()
     
-    # Check AWS CLI
-    try:
-        result = subprocess.run(['aws', '--version'], capture_output=True, text=True)
-        if result.returncode == 0:
-            print("✅ AWS CLI available")
-        else:
-            issues.append("AWS CLI not working")
-    except FileNotFoundError:
-        issues.append("AWS CLI not installed")
-    
-    # Check AWS credentials
-    try:
-        session = boto3.Session()
-        credentials = session.get_credentials()
-        if credentials:
-            print("✅ AWS credentials configured")
-        else:
-            issues.append("AWS credentials not configured")
-    except Exception as e:
-        issues.append(f"AWS credentials error: {e}")
+    checks = [_check_aws_cli, _check_credentials]
+    checks += [(lambda f=f: _check_file(f, file_status)) for f in WEBSITE_FILES]
     
-    # Check required files
-    required_files = [
-        'index.html',
-        'amplify.yml'
-    ]
+    # The checks are independent, so run them side by side; map() keeps
+    # the results in submission order for printing
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(lambda check: check(), checks))
     
-    for file in required_files:
-        if os.path.exists(file):
-            print(f"✅ {file} found")
-        else:
-            issues.append(f"Missing required file: {file}")
+    issues = []
+    for message, issue in results:
+        if message:
+            print(message)
+        if issue:
+            issues.append(issue)
     
     return issues
 
+# Build spec and SPA rewrite rule for the Amplify app, built once at import
+_BUILD_SPEC = """version: 1
+frontend:
+  phases:
+    preBuild:
+      commands:
+        - echo "PropertyPilot Real Estate Platform - Build Started"
+    build:
+      commands:
+        - echo "Building PropertyPilot website"
+    postBuild:
+      commands:
+        - echo "PropertyPilot build completed"
+  artifacts:
+    baseDirectory: /
+    files:
+      - '**/*'
+  cache:
+    paths: []"""
+
+_CUSTOM_RULES = (
+    {
+        'source': '/<*>',
+        'target': '/index.html',
+        'status': '404-200'
+    },
+)
+
 def create_amplify_app():
     """Create AWS Amplify application"""
     print_step(2, "Creating AWS Amplify Application")
     
     try:
-        amplify_client = boto3.client('amplify')
+        amplify_client = amplify()
         
         app_name = "PropertyPilot-RealEstate-Platform"
         
         # Check if app already exists
         try:
-            apps = amplify_client.list_apps()
             existing_app = None
-            for app in apps['apps']:
-                if app['name'] == app_name:
-                    existing_app = app
+            paginator = amplify_client.get_paginator('list_apps')
+            for page in paginator.paginate(PaginationConfig={'PageSize': 100}):
+                existing_app = next((app for app in page['apps'] if app['name'] == app_name), None)
+                if existing_app:
                     break
             
             if existing_app:
@@ -105,31 +187,8 @@ def create_amplify_app():
             enableBranchAutoBuild=False,
             enableBranchAutoDeletion=False,
             enableBasicAuth=False,
-            buildSpec="""version: 1
-frontend:
-  phases:
-    preBuild:
-      commands:
-        - echo "PropertyPilot Real Estate Platform - Build Started"
-    build:
-      commands:
-        - echo "Building PropertyPilot website"
-    postBuild:
-      commands:
-        - echo "PropertyPilot build completed"
-  artifacts:
-    baseDirectory: /
-    files:
-      - '**/*'
-  cache:
-    paths: []""",
-            customRules=[
-                {
-                    'source': '/<*>',
-                    'target': '/index.html',
-                    'status': '404-200'
-                }
-            ]
+            buildSpec=_BUILD_SPEC,
+            customRules=_CUSTOM_RULES
         )
         
         app = response['app']
@@ -152,17 +211,17 @@ def create_amplify_branch(app_id):
     print_step(3, "Creating Amplify Branch")
     
     try:
-        amplify_client = boto3.client('amplify')
+        amplify_client = amplify()
         
         branch_name = "main"
         
         # Check if branch already exists
         try:
-            branches = amplify_client.list_branches(appId=app_id)
             existing_branch = None
-            for branch in branches['branches']:
-                if branch['branchName'] == branch_name:
-                    existing_branch = branch
+            paginator = amplify_client.get_paginator('list_branches')
+            for page in paginator.paginate(appId=app_id, PaginationConfig={'PageSize': 50}):
+                existing_branch = next((branch for branch in page['branches'] if branch['branchName'] == branch_name), None)
+                if existing_branch:
                     break
             
             if existing_branch:
@@ -200,46 +259,90 @@ def create_amplify_branch(app_id):
         print(f"❌ Unexpected error creating branch: {e}")
         return None
 
-def deploy_to_amplify(app_id, branch_name="main"):
+def _upload_file(url, path):
+    """PUT one website file to its presigned Amplify upload URL"""
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            _HTTP.put(url, data=b'', timeout=60).raise_for_status()
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            _HTTP.put(url, data=mapped, timeout=60).raise_for_status()
+
+def _digest(path):
+    """SHA-256 and MD5 hex digests of a file, both fed from one pass over an mmap"""
+    sha256 = hashlib.sha256()
+    md5 = hashlib.md5(usedforsecurity=False)
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size > 0:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                view = memoryview(mapped)
+                try:
+                    for offset in range(0, len(view), 1 << 20):
+                        with view[offset:offset + (1 << 20)] as chunk:
+                            sha256.update(chunk)
+                            md5.update(chunk)
+                finally:
+                    view.release()
+    return {'sha256': sha256.hexdigest(), 'md5': md5.hexdigest()}
+
+def get_file_hashes(file_status):
+    """SHA-256 and MD5 digests of each website file present, keyed by name"""
+    return {name: _digest(name) for name in WEBSITE_FILES if file_status[name]}
+
+def load_previous_file_hashes(app_id, branch_name):
+    """File hashes recorded by the last successful deployment of this branch"""
+    try:
+        with open(SUMMARY_FILE, 'rb') as f:
+            raw = f.read()
+        previous = orjson.loads(raw) if orjson is not None else json.loads(raw)
+    except (OSError, ValueError):
+        return None
+    
+    if (previous.get('app_info', {}).get('app_id') != app_id
+            or previous.get('branch_info', {}).get('branch_name') != branch_name):
+        return None
+    return previous.get('file_hashes')
+
+def deploy_to_amplify(app_id, branch_name="main", file_status=None, file_hashes=None):
     """Deploy website files to Amplify"""
     print_step(4, "Deploying Website to Amplify")
     
     try:
-        amplify_client = boto3.client('amplify')
-        
-        # Create deployment
-        print("📦 Creating deployment...")
+        if file_status is None:
+            file_status = get_file_status()
+        if file_hashes is None:
+            file_hashes = get_file_hashes(file_status)
         
-        # Read website files
-        files_to_deploy = {}
+        # Content-addressed skip: nothing to upload if every file matches the
+        # hashes recorded after the last successful deployment
+        if file_hashes and file_hashes == load_previous_file_hashes(app_id, branch_name):
+            print("✅ No changes, skipping deployment")
+            return True
         
-        # Read index.html
-        if os.path.exists('index.html'):
-            with open('index.html', 'r', encoding='utf-8') as f:
-                files_to_deploy['index.html'] = f.read()
+        amplify_client = amplify()
         
-        # Read amplify.yml
-        if os.path.exists('amplify.yml'):
-            with open('amplify.yml', 'r', encoding='utf-8') as f:
-                files_to_deploy['amplify.yml'] = f.read()
-        
-        # Create a zip file for deployment
-        import zipfile
-        import io
+        # Create deployment
+        print("📦 Creating deployment...")
         
-        zip_buffer = io.BytesIO()
-        with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-            for filename, content in files_to_deploy.items():
-                zip_file.writestr(filename, content)
+        # Register each file by the MD5 hashed alongside the skip check, then
+        # PUT them to their presigned URLs in parallel, streaming straight
+        # from an mmap of the file
+        file_map = {filename: hashes['md5'] for filename, hashes in file_hashes.items()}
+        deployment = amplify_client.create_deployment(appId=app_id, branchName=branch_name, fileMap=file_map)
         
-        zip_buffer.seek(0)
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            uploads = [
+                executor.submit(_upload_file, upload_url, filename)
+                for filename, upload_url in deployment['fileUploadUrls'].items()
+            ]
+            for upload in uploads:
+                upload.result()
         
         # Start deployment
         response = amplify_client.start_deployment(
             appId=app_id,
             branchName=branch_name,
-            sourceUrl="",  # We'll upload files directly
-            fileMap=files_to_deploy
+            jobId=deployment['jobId']
         )
         
         job_id = response['jobSummary']['jobId']
@@ -251,6 +354,7 @@ def deploy_to_amplify(app_id, branch_name="main"):
         
         max_wait_time = 300  # 5 minutes
         start_time = time.time()
+        delay = 1.0
         
         while time.time() - start_time < max_wait_time:
             try:
@@ -271,11 +375,18 @@ def deploy_to_amplify(app_id, branch_name="main"):
                     return False
                 else:
                     print(f"   Status: {job_status}...")
-                    time.sleep(10)
                     
+            except ClientError as e:
+                if e.response['Error']['Code'] == 'ThrottlingException':
+                    # Back off harder when Amplify is throttling us
+                    delay = min(delay * 2, 15)
+                print(f"⚠️ Error checking deployment status: {e}")
             except Exception as e:
                 print(f"⚠️ Error checking deployment status: {e}")
-                time.sleep(10)
+            
+            # Poll quickly at first so short deployments are noticed promptly
+            time.sleep(delay)
+            delay = min(delay * 2, 15)
         
         print("⚠️ Deployment timeout - check Amplify console for status")
         return False
@@ -292,7 +403,7 @@ def configure_custom_domain(app_id, domain_name=None):
     print_step(5, f"Configuring Custom Domain: {domain_name}")
     
     try:
-        amplify_client = boto3.client('amplify')
+        amplify_client = amplify()
         
         response = amplify_client.create_domain_association(
             appId=app_id,
@@ -330,10 +441,15 @@ def get_agentcore_endpoint():
             'deployment_info.json'
         ]
         
+        # One directory listing instead of a stat per candidate file
+        with os.scandir('.') as it:
+            present = {entry.name for entry in it}
+        
         for file_path in deployment_files:
-            if os.path.exists(file_path):
-                with open(file_path, 'r') as f:
-                    config = json.load(f)
+            if file_path in present:
+                with open(file_path, 'rb') as f:
+                    raw = f.read()
+                config = orjson.loads(raw) if orjson is not None else json.loads(raw)
                     
                 endpoint = config.get('agentcore_endpoint') or config.get('endpoint_url')
                 if endpoint:
@@ -345,7 +461,7 @@ def get_agentcore_endpoint():
         print(f"⚠️ Could not get AgentCore endpoint: {e}")
         return None
 
-def create_deployment_summary(app_info, branch_info, endpoint_url=None):
+def create_deployment_summary(app_info, branch_info, endpoint_url=None, file_hashes=None):
     """Create deployment summary"""
     print_step(6, "Creating Deployment Summary")
     
@@ -357,7 +473,7 @@ def create_deployment_summary(app_info, branch_info, endpoint_url=None):
     
     summary = {
         "deployment_type": "AWS Amplify",
-        "timestamp": datetime.now().isoformat(),
+        "timestamp": datetime.now(timezone.utc),
         "app_info": {
             "app_id": app_id,
             "app_name": app_info['name'],
@@ -373,6 +489,7 @@ def create_deployment_summary(app_info, branch_info, endpoint_url=None):
             "amplify_console": f"https://console.aws.amazon.com/amplify/home#/{app_id}"
         },
         "agentcore_endpoint": endpoint_url,
+        "file_hashes": file_hashes or {},
         "next_steps": [
             "Open the Amplify URL to access your PropertyPilot website",
             "Configure the AgentCore endpoint in the website interface",
@@ -382,9 +499,14 @@ def create_deployment_summary(app_info, branch_info, endpoint_url=None):
         ]
     }
     
-    # Save summary
-    with open('amplify_deployment_summary.json', 'w') as f:
-        json.dump(summary, f, indent=2)
+    # Save summary; orjson serializes the datetime natively, the stdlib
+    # fallback formats it the same way via isoformat()
+    if orjson is not None:
+        with open(SUMMARY_FILE, 'wb') as f:
+            f.write(orjson.dumps(summary, option=orjson.OPT_INDENT_2))
+    else:
+        with open(SUMMARY_FILE, 'w') as f:
+            json.dump(summary, f, indent=2, default=datetime.isoformat)
     
     print("✅ Deployment summary saved to amplify_deployment_summary.json")
     
@@ -402,8 +524,11 @@ def main():
     print("   5. Configure domain (optional)")
     print("   6. Create deployment summary")
     
-    # Step 1: Check prerequisites
-    issues = check_prerequisites()
+    file_status = get_file_status()
+    
+    # Step 1: Check prerequisites (this also warms the shared session's
+    # credentials, which every later Amplify call reuses)
+    issues = check_prerequisites(file_status)
     
     if issues:
         print(f"\n❌ Prerequisites not met:")
@@ -427,7 +552,8 @@ def main():
         return False
     
     # Step 4: Deploy website
-    deployment_success = deploy_to_amplify(app_info['appId'], branch_info['branchName'])
+    file_hashes = get_file_hashes(file_status)
+    deployment_success = deploy_to_amplify(app_info['appId'], branch_info['branchName'], file_status, file_hashes)
     if not deployment_success:
         print("❌ Deployment failed. Check Amplify console for details.")
         return False
@@ -442,7 +568,7 @@ def main():
     endpoint_url = get_agentcore_endpoint()
     
     # Step 6: Create deployment summary
-    summary = create_deployment_summary(app_info, branch_info, endpoint_url)
+    summary = create_deployment_summary(app_info, branch_info, endpoint_url, file_hashes)
     
     print_header("Deployment Complete!")
     
@@ -28,25 +28,39 @@ def create_deployment_package():
     """Create a deployment package with all website files"""
     print_step(1, "Creating Deployment Package")
     
+    print("📦 Packaging website files...")
+    
+    # Add main files
+    files_to_include = [
+        'index.html',
+        'amplify.yml'
+    ]
+    
+    existing = []
+    for file in files_to_include:
+        if os.path.exists(file):
+            existing.append(file)
+            print(f"   ✅ Added {file}")
+        else:
+            print(f"   ⚠️ Missing {file}")
+    
+    if not existing:
+        raise FileNotFoundError("No website files to package; index.html is missing")
+    
+    # Amplify's drag-and-drop upload accepts a bare file, so a lone
+    # index.html needs no archive
+    if existing == ['index.html']:
+        print(f"✅ Single file, no package needed: {existing[0]}")
+        return existing[0]
+    
     # Create temporary directory
     temp_dir = tempfile.mkdtemp()
     zip_path = os.path.join(temp_dir, "propertypilot-website.zip")
     
-    print("📦 Packaging website files...")
-    
-    with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-        # Add main files
-        files_to_include = [
-            'index.html',
-            'amplify.yml'
-        ]
-        
-        for file in files_to_include:
-            if os.path.exists(file):
-                zipf.write(file, file)
-                print(f"   ✅ Added {file}")
-            else:
-                print(f"   ⚠️ Missing {file}")
+    # Stored, not deflated: Amplify's CDN compresses assets for transport
+    with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_STORED) as zipf:
+        for file in existing:
+            zipf.write(file, file)
     
     print(f"✅ Deployment package created: {zip_path}")
     return zip_path
@@ -230,13 +244,15 @@ def main():
     
     print("📁 Files ready for deployment:")
     print("   - index.html (main website)")
-    print("   - amplify.yml (build configuration)")
-    print(f"   - {zip_path} (deployment package)")
+    if zip_path.endswith('.zip'):
+        print("   - amplify.yml (build configuration)")
+        print(f"   - {zip_path} (deployment package)")
     
     print("\n🌐 Deployment Options:")
     print("   1. AWS Amplify Console (recommended)")
     print("   2. Drag & drop index.html")
-    print("   3. Use deployment package zip file")
+    if zip_path.endswith('.zip'):
+        print("   3. Use deployment package zip file")
     
     if agentcore_deployed:
         print(f"\n🤖 AgentCore Ready:")
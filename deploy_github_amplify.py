@@ -5,39 +5,103 @@ Deploy PropertyPilot real estate platform via GitHub integration
 """
 
 import os
+import functools
 import json
+import shlex
+import shutil
 import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from urllib.parse import urlsplit
+
+# Endpoint input placeholder in index.html, filled in once AgentCore is deployed
+ENDPOINT_PLACEHOLDER = b'placeholder="https://bedrock-agentcore.us-west-2.amazonaws.com/runtimes/your-runtime-id/invoke"'
+
+# Repository facts looked up once by check_git_status: 'origin' (URL or
+# None) and 'head' (commit id, or None before the first commit)
+_GIT_STATE = {}
+
+class _GitSession:
+    """A single `git cat-file --batch-check` process answering ref lookups.
+    
+    Each lookup is a line written to the process instead of a new git
+    process. Outside a repository git exits at once, which shows up as
+    in_repository going False on the first lookup.
+    """
+    
+    def __enter__(self):
+        self.proc = subprocess.Popen(
+            ['git', 'cat-file', '--batch-check=%(objectname)'],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True
+        )
+        self.in_repository = True
+        return self
+    
+    def resolve(self, ref):
+        """Object id that ref points to, or None if it does not exist"""
+        try:
+            self.proc.stdin.write(f"{ref}\n")
+            self.proc.stdin.flush()
+            line = self.proc.stdout.readline()
+        except (BrokenPipeError, OSError):
+            line = ''
+        
+        if not line:
+            self.in_repository = False
+            return None
+        
+        line = line.strip()
+        return None if line.endswith(' missing') else line
+    
+    def __exit__(self, *exc_info):
+        try:
+            self.proc.stdin.close()
+        except (BrokenPipeError, OSError):
+            pass
+        self.proc.wait()
+        self.proc.stdout.close()
+        return False
 
 def print_header(title):
     """Print a formatted header"""
-    print("\n" + "=" * 60)
-    print(f"🚀 {title}")
-    print("=" * 60)
+    rule = "=" * 60
+    sys.stdout.write(f"\n{rule}\n🚀 {title}\n{rule}\n")
 
 def print_step(step, description):
     """Print a formatted step"""
-    print(f"\n📋 Step {step}: {description}")
-    print("-" * 40)
+    sys.stdout.write(f"\n📋 Step {step}: {description}\n{'-' * 40}\n")
 
 def check_git_status():
     """Check Git repository status"""
     print_step(1, "Checking Git Repository Status")
     
     try:
-        # Check if we're in a git repository
-        result = subprocess.run(['git', 'status'], capture_output=True, text=True)
-        if result.returncode != 0:
-            print("❌ Not in a Git repository")
-            return False
+        # Check if we're in a git repository (no working tree scan); the same
+        # helper process also resolves HEAD for the commit step
+        with _GitSession() as git:
+            head = git.resolve('HEAD')
+            if not git.in_repository:
+                print("❌ Not in a Git repository")
+                return False
+        _GIT_STATE['head'] = head
         
         print("✅ Git repository detected")
         
-        # Check for remote origin
-        result = subprocess.run(['git', 'remote', 'get-url', 'origin'], capture_output=True, text=True)
-        if result.returncode == 0:
-            remote_url = result.stdout.strip()
+        # Check for remote origin; reading the config skips the refs database
+        result = subprocess.run(
+            ['git', 'config', '--get', 'remote.origin.url'],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True
+        )
+        remote_url = result.stdout.strip() if result.returncode == 0 else None
+        _GIT_STATE['origin'] = remote_url
+        
+        if remote_url:
             print(f"✅ Remote origin: {remote_url}")
             return True, remote_url
         else:
@@ -73,13 +137,14 @@ def setup_github_repository():
         return None
     
     # Validate URL format
-    if not repo_url.startswith('https://github.com/'):
+    parsed = urlsplit(repo_url)
+    if parsed.scheme != 'https' or parsed.netloc != 'github.com':
         print("❌ Please use HTTPS GitHub URL format: https://github.com/username/repo")
         return None
     
     return repo_url
 
-def prepare_website_files():
+def prepare_website_files(today):
     """Prepare website files for deployment"""
     print_step(3, "Preparing Website Files for GitHub")
     
@@ -87,15 +152,23 @@ def prepare_website_files():
     required_files = ['index.html', 'amplify.yml']
     missing_files = []
     
+    # One directory listing instead of a stat per file
+    with os.scandir('.') as it:
+        present = {entry.name for entry in it if entry.is_file()}
+    
+    lines = []
     for file in required_files:
-        if os.path.exists(file):
-            print(f"✅ {file} ready")
+        if file in present:
+            lines.append(f"✅ {file} ready")
         else:
             missing_files.append(file)
-            print(f"❌ {file} missing")
+            lines.append(f"❌ {file} missing")
+    
+    if missing_files:
+        lines.append(f"❌ Missing required files: {missing_files}")
+    sys.stdout.write("\n".join(lines) + "\n")
     
     if missing_files:
-        print(f"❌ Missing required files: {missing_files}")
         return False
     
     # Update index.html with AgentCore endpoint if available
@@ -105,11 +178,20 @@ def prepare_website_files():
         update_index_with_endpoint(endpoint_url)
     
     # Create README for GitHub
-    create_github_readme()
+    create_github_readme(today)
     
     print("✅ Website files prepared for GitHub deployment")
     return True
 
+def _try_load_config(file_path):
+    """Parsed JSON config, or None if the file does not exist"""
+    try:
+        with open(file_path, 'rb') as f:
+            return json.loads(f.read())
+    except FileNotFoundError:
+        return None
+
+@functools.lru_cache(maxsize=1)
 def get_agentcore_endpoint():
     """Get AgentCore endpoint from config files"""
     try:
@@ -118,13 +200,15 @@ def get_agentcore_endpoint():
             'agentcore_deployment_info.json'
         ]
         
-        for file_path in config_files:
-            if os.path.exists(file_path):
-                with open(file_path, 'r') as f:
-                    config = json.load(f)
-                    endpoint = config.get('agentcore_endpoint') or config.get('endpoint_url')
-                    if endpoint:
-                        return endpoint
+        # Open every candidate at once so slow filesystems pay one round of
+        # latency; map() still yields them in priority order
+        with ThreadPoolExecutor(max_workers=len(config_files)) as executor:
+            for config in executor.map(_try_load_config, config_files):
+                if not config:
+                    continue
+                endpoint = config.get('agentcore_endpoint') or config.get('endpoint_url')
+                if endpoint:
+                    return endpoint
         return None
     except Exception as e:
         print(f"⚠️ Could not get AgentCore endpoint: {e}")
@@ -133,26 +217,30 @@ def get_agentcore_endpoint():
 def update_index_with_endpoint(endpoint_url):
     """Update index.html with the AgentCore endpoint"""
     try:
-        with open('index.html', 'r', encoding='utf-8') as f:
+        # Replace placeholder with actual endpoint, working on raw bytes in a
+        # single read/write handle rather than decoding the page to str
+        with open('index.html', 'r+b') as f:
             content = f.read()
-        
-        # Replace placeholder with actual endpoint
-        updated_content = content.replace(
-            'placeholder="https://bedrock-agentcore.us-west-2.amazonaws.com/runtimes/your-runtime-id/invoke"',
-            f'placeholder="{endpoint_url}" value="{endpoint_url}"'
-        )
-        
-        with open('index.html', 'w', encoding='utf-8') as f:
+            updated_content = content.replace(
+                ENDPOINT_PLACEHOLDER,
+                f'placeholder="{endpoint_url}" value="{endpoint_url}"'.encode('utf-8')
+            )
+            
+            if updated_content == content:
+                print("✅ index.html already up to date")
+                return
+            
+            f.seek(0)
             f.write(updated_content)
+            f.truncate()
         
         print("✅ Updated index.html with AgentCore endpoint")
         
     except Exception as e:
         print(f"⚠️ Could not update index.html: {e}")
 
-def create_github_readme():
-    """Create README.md for GitHub repository"""
-    readme_content = f"""# PropertyPilot - AI Real Estate Investment Platform
+# README.md for the website repository; {last_updated} is filled per run
+_README_TEMPLATE = """# PropertyPilot - AI Real Estate Investment Platform
 
 🏠 Professional real estate investment analysis powered by AI and deployed on AWS Amplify.
 
@@ -257,42 +345,94 @@ Fully responsive design optimized for:
 
 *Built with AWS Bedrock AgentCore • Deployed on AWS Amplify • Powered by Google Gemini*
 
-Last updated: {datetime.now().strftime('%Y-%m-%d')}
+Last updated: {last_updated}
 """
+
+_README_BYTES = _README_TEMPLATE.encode('utf-8')
+
+def _fill_template(template, fields):
+    """Substitute {name} fields into a pre-encoded template, staying in bytes"""
+    for name, value in fields.items():
+        template = template.replace(b'{' + name.encode('ascii') + b'}', value.encode('utf-8'))
+    return template
+
+def create_github_readme(today):
+    """Create README.md for GitHub repository"""
+    readme_content = _fill_template(_README_BYTES, {'last_updated': today})
     
-    with open('README.md', 'w', encoding='utf-8') as f:
+    with open('README.md', 'wb') as f:
         f.write(readme_content)
     
     print("✅ Created README.md for GitHub")
 
-def commit_and_push_to_github(repo_url):
+def _push_step_by_step(repo_url, add_origin, commit_message):
+    """Run the commit/push sequence as one git process per step, for hosts without bash"""
+    if add_origin is None:
+        add_origin = subprocess.run(
+            ['git', 'remote', 'get-url', 'origin'],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL
+        ).returncode != 0
+    if add_origin:
+        subprocess.run(['git', 'remote', 'add', 'origin', repo_url], check=True)
+    
+    if commit_message:
+        subprocess.run(['git', 'add', '.'], stdout=subprocess.DEVNULL, check=True)
+        subprocess.run(['git', 'commit', '-m', commit_message], check=True)
+    
+    if subprocess.run(['git', 'push', '-u', 'origin', 'main'], stderr=subprocess.DEVNULL).returncode != 0:
+        print("🔄 Trying master branch...")
+        subprocess.run(['git', 'push', '-u', 'origin', 'master'], check=True)
+
+def commit_and_push_to_github(repo_url, now_str):
     """Commit and push files to GitHub"""
     print_step(4, "Committing and Pushing to GitHub")
     
+    commit_message = f"Deploy PropertyPilot Real Estate Investment Platform - {now_str}"
+    
+    # One shell runs the whole sequence instead of a git process per step:
+    # add origin if missing, stage, commit, then push main (or master).
+    # add_origin is None when it is not yet known whether origin exists
+    parts = []
+    add_origin = False
+    if 'origin' not in _GIT_STATE:
+        add_origin = None
+        parts.append(f"{{ git remote get-url origin >/dev/null 2>&1 || git remote add origin {shlex.quote(repo_url)}; }}")
+    elif not _GIT_STATE['origin']:
+        print(f"🔗 Adding remote origin: {repo_url}")
+        add_origin = True
+        parts.append(f"git remote add origin {shlex.quote(repo_url)}")
+    
     try:
-        # Add remote if not exists
-        result = subprocess.run(['git', 'remote', 'get-url', 'origin'], capture_output=True, text=True)
-        if result.returncode != 0:
-            print(f"🔗 Adding remote origin: {repo_url}")
-            subprocess.run(['git', 'remote', 'add', 'origin', repo_url], check=True)
-        
-        # Add all files
-        print("📁 Adding files to Git...")
-        subprocess.run(['git', 'add', '.'], check=True)
-        
-        # Commit
-        commit_message = f"Deploy PropertyPilot Real Estate Investment Platform - {datetime.now().strftime('%Y-%m-%d %H:%M')}"
-        print(f"💾 Committing: {commit_message}")
-        subprocess.run(['git', 'commit', '-m', commit_message], check=True)
+        # Nothing changed since the last commit: skip staging and committing
+        # (which would hash the whole tree and then fail) and just push
+        if 'head' not in _GIT_STATE:
+            with _GitSession() as git:
+                _GIT_STATE['head'] = git.resolve('HEAD')
+        status = subprocess.run(
+            ['git', 'status', '--porcelain', '-uall'],
+            stdout=subprocess.PIPE,
+            text=True,
+            check=True
+        )
+        if _GIT_STATE['head'] and not status.stdout.strip():
+            print("✅ Working tree clean, nothing new to commit")
+            commit_message = None
+        else:
+            print(f"📁 Adding files and committing: {commit_message}")
+            parts += [
+                "git add . >/dev/null",
+                f"git commit -m {shlex.quote(commit_message)}",
+            ]
+        parts.append("{ git push -u origin main 2>/dev/null || { echo '🔄 Trying master branch...'; git push -u origin master; }; }")
         
-        # Push to GitHub
         print("🚀 Pushing to GitHub...")
-        result = subprocess.run(['git', 'push', '-u', 'origin', 'main'], capture_output=True, text=True)
-        
-        if result.returncode != 0:
-            # Try master branch if main fails
-            print("🔄 Trying master branch...")
-            subprocess.run(['git', 'push', '-u', 'origin', 'master'], check=True)
+        bash = shutil.which('bash')
+        if bash:
+            subprocess.run(" && ".join(parts), shell=True, executable=bash, check=True)
+        else:
+            # e.g. Windows without Git Bash on PATH
+            _push_step_by_step(repo_url, add_origin, commit_message)
         
         print("✅ Successfully pushed to GitHub!")
         return True
@@ -300,17 +440,12 @@ def commit_and_push_to_github(repo_url):
     except subprocess.CalledProcessError as e:
         print(f"❌ Git operation failed: {e}")
         return False
+    except OSError as e:
+        print(f"❌ Could not run git: {e}")
+        return False
 
-def create_amplify_instructions(repo_url):
-    """Create AWS Amplify setup instructions"""
-    print_step(5, "Creating AWS Amplify Setup Instructions")
-    
-    # Extract username and repo name from URL
-    parts = repo_url.replace('https://github.com/', '').split('/')
-    username = parts[0]
-    repo_name = parts[1]
-    
-    instructions = f"""# AWS Amplify Setup Instructions
+# AMPLIFY_SETUP_INSTRUCTIONS.md; filled with the repository owner, name and URL
+_INSTRUCTIONS_TEMPLATE = """# AWS Amplify Setup Instructions
 
 ## 🚀 Connect GitHub Repository to AWS Amplify
 
@@ -419,8 +554,28 @@ To update your website:
 
 Repository: {repo_url}
 """
+
+_INSTRUCTIONS_BYTES = _INSTRUCTIONS_TEMPLATE.encode('utf-8')
+
+def create_amplify_instructions(repo_url):
+    """Create AWS Amplify setup instructions"""
+    print_step(5, "Creating AWS Amplify Setup Instructions")
+    
+    # Extract username and repo name from URL (tolerates a trailing slash,
+    # a .git suffix and scp-style git@github.com:user/repo remotes)
+    parsed = urlsplit(repo_url)
+    path = parsed.path if parsed.netloc else repo_url.rpartition(':')[2]
+    parts = path.strip('/').removesuffix('.git').split('/', 1)
+    username = parts[0]
+    repo_name = parts[1] if len(parts) > 1 else ''
+    
+    instructions = _fill_template(_INSTRUCTIONS_BYTES, {
+        'username': username,
+        'repo_name': repo_name,
+        'repo_url': repo_url
+    })
     
-    with open('AMPLIFY_SETUP_INSTRUCTIONS.md', 'w', encoding='utf-8') as f:
+    with open('AMPLIFY_SETUP_INSTRUCTIONS.md', 'wb') as f:
         f.write(instructions)
     
     print("✅ Created AMPLIFY_SETUP_INSTRUCTIONS.md")
@@ -437,6 +592,11 @@ def main():
     print("   4. Push to GitHub")
     print("   5. Create Amplify setup instructions")
     
+    # One timestamp for the whole run, so the README date and the commit
+    # message always agree
+    now_str = datetime.now().strftime('%Y-%m-%d %H:%M')
+    today = now_str[:10]
+    
     # Step 1: Check Git status
     git_status = check_git_status()
     if git_status is False:
@@ -455,11 +615,11 @@ def main():
             return False
     
     # Step 3: Prepare website files
-    if not prepare_website_files():
+    if not prepare_website_files(today):
         return False
     
     # Step 4: Commit and push to GitHub
-    if not commit_and_push_to_github(repo_url):
+    if not commit_and_push_to_github(repo_url, now_str):
         print("❌ Failed to push to GitHub")
         return False
     
@@ -4,12 +4,68 @@ Simple PropertyPilot API Deployment
 Deploy a simple API that connects your existing AgentCore to the website
 """
 
-import os
+import base64
+import functools
+import hashlib
+import io
 import json
+import os
+import pathlib
+import shutil
 import subprocess
 import sys
+import zipfile
 import boto3
-from datetime import datetime
+from botocore.config import Config
+from botocore.exceptions import ClientError
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+# Shared session and clients, built once per service instead of per function
+_SESSION = boto3.session.Session()
+_CLIENTS = {}
+_CFG = Config(
+    max_pool_connections=50,
+    tcp_keepalive=True,
+    retries={'max_attempts': 5, 'mode': 'adaptive'},
+    connect_timeout=5,
+    read_timeout=60
+)
+
+def aws_client(service):
+    """Return the shared client for a service, creating it on first use"""
+    if service not in _CLIENTS:
+        _CLIENTS[service] = _SESSION.client(service, config=_CFG)
+    return _CLIENTS[service]
+
+# Account IDs already resolved, keyed by access key, so later runs skip STS
+ACCOUNT_CACHE_PATH = pathlib.Path('~/.propertypilot/account.json').expanduser()
+
+@functools.lru_cache(maxsize=None)
+def get_account_id():
+    """AWS account ID for the current credentials, via a read-through disk cache"""
+    credentials = _SESSION.get_credentials()
+    access_key = credentials.access_key if credentials else None
+    
+    try:
+        cached = json.loads(ACCOUNT_CACHE_PATH.read_bytes())
+    except (OSError, ValueError):
+        cached = {}
+    
+    if access_key and access_key in cached:
+        return cached[access_key]
+    
+    account_id = aws_client('sts').get_caller_identity()['Account']
+    
+    if access_key:
+        cached[access_key] = account_id
+        try:
+            ACCOUNT_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+            ACCOUNT_CACHE_PATH.write_text(json.dumps(cached))
+        except OSError:
+            pass  # Cache is best effort
+    
+    return account_id
 
 def print_header(title):
     """Print a formatted header"""
@@ -26,287 +82,138 @@ def get_agentcore_endpoint():
     except:
         return "https://bedrock-agentcore.us-east-1.amazonaws.com/runtimes/PropertyPilotGeminiEnhanced-A9pB9q790m/invoke"
 
-def create_simple_lambda_function():
-    """Create a simple Lambda function for PropertyPilot API"""
-    
-    agentcore_endpoint = get_agentcore_endpoint()
-    
-    lambda_code = f'''
-import json
-import urllib3
-import logging
+def get_agentcore_runtime():
+    """Region and ARN of the AgentCore runtime behind the configured endpoint"""
+    # Endpoint looks like https://bedrock-agentcore.<region>.amazonaws.com/runtimes/<id>/invoke
+    endpoint = urlsplit(get_agentcore_endpoint())
+    region = endpoint.hostname.split('.')[1]
+    runtime_id = endpoint.path.rstrip('/').split('/')[-2]
+    return region, f"arn:aws:bedrock-agentcore:{region}:{get_account_id()}:runtime/{runtime_id}"
 
-# Configure logging
-logger = logging.getLogger()
-logger.setLevel(logging.INFO)
+# Handler source, shipped unchanged so identical code gives an identical zip
+LAMBDA_SOURCE = pathlib.Path(__file__).resolve().parent / 'lambda_src' / 'handler.py'
 
-# HTTP client
-http = urllib3.PoolManager()
+def lambda_environment():
+    """Environment variables the handler reads at cold start"""
+    agentcore_region, agentcore_runtime_arn = get_agentcore_runtime()
+    return {
+        'Variables': {
+            'AGENTCORE_REGION': agentcore_region,
+            'AGENTCORE_RUNTIME_ARN': agentcore_runtime_arn
+        }
+    }
 
-# AgentCore endpoint
-AGENTCORE_ENDPOINT = "{agentcore_endpoint}"
+# Requests are served through this alias. Provisioned concurrency keeps warm
+# environments behind it but is billed while idle, so it is opt-in
+LIVE_ALIAS = 'live'
+PROVISIONED_CONCURRENCY = int(os.getenv('PROVISIONED_CONCURRENCY', '0'))
 
-def lambda_handler(event, context):
-    """PropertyPilot API Lambda handler"""
+def publish_live_alias(lambda_client, function_name):
+    """Publish the deployed code behind the 'live' alias and return its ARN"""
+    # Versions can only be published once the create/update has settled
+    lambda_client.get_waiter('function_active_v2').wait(FunctionName=function_name)
+    lambda_client.get_waiter('function_updated_v2').wait(FunctionName=function_name)
     
-    try:
-        # Handle CORS preflight
-        if event.get('httpMethod') == 'OPTIONS':
-            return {{
-                'statusCode': 200,
-                'headers': {{
-                    'Access-Control-Allow-Origin': '*',
-                    'Access-Control-Allow-Methods': 'GET, POST, OPTIONS',
-                    'Access-Control-Allow-Headers': 'Content-Type, Authorization'
-                }},
-                'body': ''
-            }}
-        
-        # Get request path and method
-        path = event.get('path', '/')
-        method = event.get('httpMethod', 'GET')
-        
-        # Health check
-        if path == '/health':
-            return {{
-                'statusCode': 200,
-                'headers': {{'Access-Control-Allow-Origin': '*', 'Content-Type': 'application/json'}},
-                'body': json.dumps({{
-                    'status': 'healthy',
-                    'service': 'PropertyPilot API',
-                    'timestamp': '{datetime.now().isoformat()}'
-                }})
-            }}
-        
-        # API documentation
-        if path == '/':
-            return {{
-                'statusCode': 200,
-                'headers': {{'Access-Control-Allow-Origin': '*', 'Content-Type': 'application/json'}},
-                'body': json.dumps({{
-                    'service': 'PropertyPilot API',
-                    'version': '1.0.0',
-                    'endpoints': {{
-                        'analyze': '/api/v1/analyze',
-                        'health': '/health'
-                    }}
-                }})
-            }}
-        
-        # Main analysis endpoint
-        if path == '/api/v1/analyze' and method == 'POST':
-            return handle_analysis(event)
-        
-        # Not found
-        return {{
-            'statusCode': 404,
-            'headers': {{'Access-Control-Allow-Origin': '*', 'Content-Type': 'application/json'}},
-            'body': json.dumps({{'error': 'Endpoint not found'}})
-        }}
-        
-    except Exception as e:
-        logger.error(f"Lambda error: {{str(e)}}")
-        return {{
-            'statusCode': 500,
-            'headers': {{'Access-Control-Allow-Origin': '*', 'Content-Type': 'application/json'}},
-            'body': json.dumps({{'error': 'Internal server error'}})
-        }}
-
-def handle_analysis(event):
-    """Handle investment analysis request"""
+    # Returns the latest version instead of a new one when the code is unchanged
+    version = lambda_client.publish_version(FunctionName=function_name)['Version']
     
     try:
-        # Parse request body
-        if event.get('body'):
-            if event.get('isBase64Encoded'):
-                import base64
-                body = base64.b64decode(event['body']).decode('utf-8')
-            else:
-                body = event['body']
-            
-            request_data = json.loads(body)
-        else:
-            raise ValueError("No request body")
-        
-        # Validate required fields
-        query = request_data.get('query', '').strip()
-        location = request_data.get('location', '').strip()
-        max_price = request_data.get('max_price', 0)
-        
-        if not query:
-            raise ValueError("Query is required")
-        if not location:
-            raise ValueError("Location is required")
-        if max_price <= 0:
-            raise ValueError("Max price must be greater than 0")
-        
-        # Prepare AgentCore payload
-        agentcore_payload = {{
-            "input": {{
-                "prompt": query,
-                "type": request_data.get('analysis_type', 'enhanced_analysis'),
-                "location": location,
-                "max_price": max_price,
-                "property_type": request_data.get('property_type', 'residential'),
-                "investment_strategy": request_data.get('investment_strategy', 'buy_hold')
-            }}
-        }}
-        
-        # Call AgentCore
-        logger.info(f"Calling AgentCore for analysis: {{location}}")
-        
-        response = http.request(
-            'POST',
-            AGENTCORE_ENDPOINT,
-            body=json.dumps(agentcore_payload),
-            headers={{'Content-Type': 'application/json'}},
-            timeout=120
+        alias = lambda_client.update_alias(
+            FunctionName=function_name,
+            Name=LIVE_ALIAS,
+            FunctionVersion=version
+        )
+    except lambda_client.exceptions.ResourceNotFoundException:
+        alias = lambda_client.create_alias(
+            FunctionName=function_name,
+            Name=LIVE_ALIAS,
+            FunctionVersion=version
         )
-        
-        if response.status != 200:
-            raise Exception(f"AgentCore error: {{response.status}}")
-        
-        agentcore_result = json.loads(response.data.decode('utf-8'))
-        
-        # Process results
-        processed_result = process_agentcore_response(agentcore_result, request_data)
-        
-        return {{
-            'statusCode': 200,
-            'headers': {{'Access-Control-Allow-Origin': '*', 'Content-Type': 'application/json'}},
-            'body': json.dumps(processed_result)
-        }}
-        
-    except ValueError as e:
-        return {{
-            'statusCode': 400,
-            'headers': {{'Access-Control-Allow-Origin': '*', 'Content-Type': 'application/json'}},
-            'body': json.dumps({{'success': False, 'error': str(e)}})
-        }}
-    except Exception as e:
-        logger.error(f"Analysis error: {{str(e)}}")
-        return {{
-            'statusCode': 503,
-            'headers': {{'Access-Control-Allow-Origin': '*', 'Content-Type': 'application/json'}},
-            'body': json.dumps({{'success': False, 'error': 'Analysis service temporarily unavailable'}})
-        }}
-
-def process_agentcore_response(agentcore_result, request_data):
-    """Process AgentCore response for frontend"""
-    
-    import uuid
-    
-    output = agentcore_result.get('output', agentcore_result)
-    
-    # Create clean response
-    result = {{
-        'success': True,
-        'message': output.get('message', f"Investment analysis completed for {{request_data.get('location')}}"),
-        'analysis_id': str(uuid.uuid4()),
-        'timestamp': '{datetime.now().isoformat()}',
-        'location': request_data.get('location'),
-        'analysis_type': request_data.get('analysis_type', 'enhanced_analysis'),
-        'processing_time': 2.5,
-        'results': {{
-            'summary': output.get('message', 'Analysis completed successfully'),
-            'analysis_data': {{}}
-        }}
-    }}
-    
-    # Extract analysis data
-    if output.get('enhanced_analysis'):
-        result['results']['analysis_data']['enhanced_analysis'] = clean_text(output['enhanced_analysis'])
-    
-    if output.get('analysis'):
-        result['results']['analysis_data']['property_analysis'] = clean_text(output['analysis'])
-    
-    if output.get('market_data'):
-        result['results']['analysis_data']['market_research'] = clean_text(output['market_data'])
-    
-    if output.get('opportunities'):
-        result['results']['analysis_data']['investment_opportunities'] = clean_text(output['opportunities'])
     
-    # Add confidence score
-    if len(result['results']['analysis_data']) >= 2:
-        result['confidence_score'] = 0.85
-    elif len(result['results']['analysis_data']) == 1:
-        result['confidence_score'] = 0.70
-    else:
-        result['confidence_score'] = 0.60
+    print(f"✅ Version {version} published as '{LIVE_ALIAS}'")
     
-    return result
-
-def clean_text(data):
-    """Clean analysis text for display"""
-    if isinstance(data, str):
-        return data
-    elif isinstance(data, dict):
-        if data.get('analysis_result'):
-            return data['analysis_result']
-        elif data.get('summary'):
-            return data['summary']
-        else:
-            return str(data)
-    else:
-        return str(data)
-'''
+    # Best effort: accounts with a low concurrency limit or quota reject it,
+    # and the code is deployed either way
+    if PROVISIONED_CONCURRENCY:
+        try:
+            lambda_client.put_provisioned_concurrency_config(
+                FunctionName=function_name,
+                Qualifier=LIVE_ALIAS,
+                ProvisionedConcurrentExecutions=PROVISIONED_CONCURRENCY
+            )
+            print(f"✅ {PROVISIONED_CONCURRENCY} warm environments provisioned for '{LIVE_ALIAS}'")
+        except ClientError as e:
+            print(f"⚠️ Could not provision concurrency for '{LIVE_ALIAS}': {e}")
     
-    return lambda_code
+    return alias['AliasArn']
 
 def deploy_lambda_function():
     """Deploy the Lambda function"""
     print("🚀 Deploying PropertyPilot API to AWS Lambda...")
     
     try:
-        lambda_client = boto3.client('lambda')
+        lambda_client = aws_client('lambda')
         
-        # Create function code
-        lambda_code = create_simple_lambda_function()
+        environment = lambda_environment()
         
-        # Create ZIP file
-        import zipfile
-        import tempfile
+        # Create ZIP file in memory
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED, compresslevel=9) as zipf:
+            # Fixed timestamp so identical code gives an identical zip;
+            # world-readable so the Lambda runtime can load it
+            info = zipfile.ZipInfo('lambda_function.py', date_time=(1980, 1, 1, 0, 0, 0))
+            info.external_attr = 0o644 << 16
+            zipf.writestr(info, LAMBDA_SOURCE.read_bytes(), compress_type=zipfile.ZIP_DEFLATED, compresslevel=9)
         
-        with tempfile.NamedTemporaryFile(suffix='.zip', delete=False) as tmp_file:
-            with zipfile.ZipFile(tmp_file.name, 'w') as zipf:
-                zipf.writestr('lambda_function.py', lambda_code)
-            
-            zip_path = tmp_file.name
-        
-        # Read ZIP content
-        with open(zip_path, 'rb') as f:
-            zip_content = f.read()
+        zip_content = buffer.getvalue()
         
         function_name = 'PropertyPilot-API'
         
+        # Lambda reports CodeSha256 as base64 of the zip's SHA-256
+        local_sha = base64.b64encode(hashlib.sha256(zip_content).digest()).decode()
+        
         try:
-            # Update existing function
-            response = lambda_client.update_function_code(
-                FunctionName=function_name,
-                ZipFile=zip_content
-            )
-            print("✅ Lambda function updated successfully")
+            current = lambda_client.get_function(FunctionName=function_name)['Configuration']
+            
+            if current['CodeSha256'] == local_sha:
+                # Same code already deployed; skip the upload and the
+                # cold starts an update would cause
+                print("✅ Lambda function code unchanged, skipping update")
+            else:
+                # Update existing function
+                lambda_client.update_function_code(
+                    FunctionName=function_name,
+                    ZipFile=zip_content
+                )
+                print("✅ Lambda function updated successfully")
+            
+            # Endpoint changes only touch configuration, not the code zip
+            if current.get('Environment', {}).get('Variables') != environment['Variables']:
+                lambda_client.get_waiter('function_updated_v2').wait(FunctionName=function_name)
+                lambda_client.update_function_configuration(
+                    FunctionName=function_name,
+                    Environment=environment
+                )
+                print("✅ Lambda environment updated")
         except lambda_client.exceptions.ResourceNotFoundException:
             # Create new function
-            sts_client = boto3.client('sts')
-            account_id = sts_client.get_caller_identity()['Account']
+            account_id = get_account_id()
             
-            response = lambda_client.create_function(
+            lambda_client.create_function(
                 FunctionName=function_name,
                 Runtime='python3.11',
                 Role=f'arn:aws:iam::{account_id}:role/PropertyPilot-Lambda-Role',
                 Handler='lambda_function.lambda_handler',
                 Code={'ZipFile': zip_content},
+                Environment=environment,
                 Description='PropertyPilot Real Estate Investment API',
                 Timeout=300,
                 MemorySize=512
             )
             print("✅ Lambda function created successfully")
         
-        # Clean up
-        os.unlink(zip_path)
-        
-        return response['FunctionArn']
+        # API Gateway integrates with the alias so it hits the warm environments
+        return publish_live_alias(lambda_client, function_name)
         
     except Exception as e:
         print(f"❌ Lambda deployment failed: {e}")
@@ -317,8 +224,8 @@ def create_api_gateway(lambda_arn):
     print("🌐 Creating API Gateway...")
     
     try:
-        apigateway = boto3.client('apigatewayv2')
-        lambda_client = boto3.client('lambda')
+        apigateway = aws_client('apigatewayv2')
+        lambda_client = aws_client('lambda')
         
         # Create API
         api_response = apigateway.create_api(
@@ -350,12 +257,20 @@ def create_api_gateway(lambda_arn):
         # Create routes
         routes = ['GET /', 'GET /health', 'POST /api/v1/analyze', 'OPTIONS /{proxy+}', 'ANY /{proxy+}']
         
-        for route in routes:
-            apigateway.create_route(
-                ApiId=api_id,
-                RouteKey=route,
-                Target=f'integrations/{integration_id}'
-            )
+        def create_route(route):
+            try:
+                apigateway.create_route(
+                    ApiId=api_id,
+                    RouteKey=route,
+                    Target=f'integrations/{integration_id}'
+                )
+            except apigateway.exceptions.ConflictException:
+                # Route already exists
+                pass
+        
+        # Routes are independent of each other, so create them concurrently
+        with ThreadPoolExecutor(max_workers=len(routes)) as executor:
+            list(executor.map(create_route, routes))
         
         # Create stage
         apigateway.create_stage(
@@ -383,27 +298,39 @@ def create_api_gateway(lambda_arn):
         print(f"❌ API Gateway creation failed: {e}")
         return None
 
+# Line in index.html that update_frontend points at the deployed API
+API_ENDPOINT_PLACEHOLDER = b"const API_ENDPOINT = '/api/v1/analyze';  // Will be updated with actual API URL after deployment"
+
 def update_frontend(api_endpoint):
     """Update frontend with API endpoint"""
     print("📝 Updating frontend...")
     
     try:
-        with open('index.html', 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        # Update API endpoint
-        updated_content = content.replace(
-            "const API_ENDPOINT = '/api/v1/analyze';  // Will be updated with actual API URL after deployment",
-            f"const API_ENDPOINT = '{api_endpoint}/api/v1/analyze';"
-        )
-        
-        with open('index.html', 'w', encoding='utf-8') as f:
-            f.write(updated_content)
-        
-        # Commit and push
-        subprocess.run(['git', 'add', 'index.html'], check=True)
-        subprocess.run(['git', 'commit', '-m', f'Connect to PropertyPilot API: {api_endpoint}'], check=True)
-        subprocess.run(['git', 'push'], check=True)
+        index_path = pathlib.Path('index.html')
+        data = index_path.read_bytes()
+        
+        # Update API endpoint by splicing bytes around the one placeholder line
+        idx = data.find(API_ENDPOINT_PLACEHOLDER)
+        if idx < 0:
+            raise RuntimeError("API endpoint placeholder not found in index.html")
+        
+        replacement = f"const API_ENDPOINT = '{api_endpoint}/api/v1/analyze';".encode('utf-8')
+        index_path.write_bytes(data[:idx] + replacement + data[idx + len(API_ENDPOINT_PLACEHOLDER):])
+        
+        # Commit and push in one shell rather than a process per git command;
+        # the message goes in as $1, so it needs no quoting
+        commit_message = f'Connect to PropertyPilot API: {api_endpoint}'
+        sh = shutil.which('sh')
+        if sh:
+            subprocess.run(
+                [sh, '-c', 'git add index.html && git commit -m "$1" && git push', 'sh', commit_message],
+                check=True
+            )
+        else:
+            # e.g. Windows without Git Bash on PATH
+            subprocess.run(['git', 'add', 'index.html'], check=True)
+            subprocess.run(['git', 'commit', '-m', commit_message], check=True)
+            subprocess.run(['git', 'push'], check=True)
         
         print("✅ Frontend updated and pushed to GitHub")
         return True
@@ -5,51 +5,109 @@ Create a simpler, more reliable Lambda function
 """
 
 import boto3
+import io
 import json
+import time
 import zipfile
-import tempfile
-import os
 
-def create_fixed_lambda_code():
-    """Create a fixed Lambda function code"""
-    
-    # Get AgentCore endpoint
+def _load_agentcore_endpoint():
+    """AgentCore endpoint from website_config.json, or the default runtime"""
     try:
         with open('website_config.json', 'r') as f:
             config = json.load(f)
-            agentcore_endpoint = config.get('agentcore_endpoint')
+            return config.get('agentcore_endpoint')
     except:
-        agentcore_endpoint = "https://bedrock-agentcore.us-east-1.amazonaws.com/runtimes/PropertyPilotGeminiEnhanced-A9pB9q790m/invoke"
+        return "https://bedrock-agentcore.us-east-1.amazonaws.com/runtimes/PropertyPilotGeminiEnhanced-A9pB9q790m/invoke"
+
+# Read once at import rather than every time the code is generated
+_AGENTCORE_ENDPOINT = _load_agentcore_endpoint()
+
+# Lambda client, created on first use
+_LAMBDA_CLIENT = None
+
+def _lambda():
+    """Return the shared Lambda client"""
+    global _LAMBDA_CLIENT
+    _LAMBDA_CLIENT = _LAMBDA_CLIENT or boto3.client('lambda')
+    return _LAMBDA_CLIENT
+
+def create_fixed_lambda_code():
+    """Create a fixed Lambda function code"""
     
-    lambda_code = f'''import json
+    agentcore_endpoint = _AGENTCORE_ENDPOINT
+    
+    lambda_code = f'''import base64
+import json
 import urllib3
 import logging
 from datetime import datetime
 import uuid
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Configure logging
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
-# HTTP client
-http = urllib3.PoolManager()
-
 # AgentCore endpoint
 AGENTCORE_ENDPOINT = "{agentcore_endpoint}"
 
+# HTTP client, created once per execution environment so warm invocations
+# reuse the keep-alive connection to AgentCore
+http = urllib3.PoolManager(
+    num_pools=4,
+    maxsize=8,
+    retries=urllib3.Retry(total=2, backoff_factor=0.1),
+    timeout=urllib3.Timeout(connect=2.0, read=120.0),
+    headers={{'Connection': 'keep-alive'}}
+)
+
+# Open the TLS connection during init, off the first request's critical path.
+# The reply itself doesn't matter, and the wait is capped so a slow or
+# unreachable endpoint can't hold up cold starts; the first real request
+# connects instead
+try:
+    http.request('HEAD', AGENTCORE_ENDPOINT, timeout=urllib3.Timeout(total=0.2), retries=False)
+except Exception:
+    pass
+
+def _loads(data):
+    """Parse JSON from str or bytes, with orjson when it is bundled"""
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+def _dumps(obj):
+    """Serialize to a JSON str (API Gateway needs str bodies)"""
+    return orjson.dumps(obj).decode() if orjson is not None else json.dumps(obj)
+
+# Same headers on every response; built once and shared
+_CORS_HEADERS = {{
+    'Access-Control-Allow-Origin': '*',
+    'Access-Control-Allow-Methods': 'GET, POST, OPTIONS',
+    'Access-Control-Allow-Headers': 'Content-Type, Authorization',
+    'Content-Type': 'application/json'
+}}
+
+_PREFLIGHT_RESPONSE = {{'statusCode': 204, 'headers': _CORS_HEADERS, 'body': ''}}
+
 def lambda_handler(event, context):
     """PropertyPilot API Lambda handler"""
     
-    logger.info(f"Received event: {{json.dumps(event)}}")
+    # Handle CORS preflight before anything else; browsers send one ahead
+    # of every cross-origin POST
+    method = event.get('requestContext', {{}}).get('http', {{}}).get('method', 'GET')
+    if method == 'OPTIONS':
+        return _PREFLIGHT_RESPONSE
+    
+    # Serializing the whole event is only worth it when debugging
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(f"Received event: {{_dumps(event)}}")
     
     try:
-        # Handle CORS preflight
-        if event.get('requestContext', {{}}).get('http', {{}}).get('method') == 'OPTIONS':
-            return cors_response(200, "")
-        
         # Get request details
         path = event.get('rawPath', '/')
-        method = event.get('requestContext', {{}}).get('http', {{}}).get('method', 'GET')
         
         logger.info(f"Processing {{method}} {{path}}")
         
@@ -71,35 +129,59 @@ def cors_response(status_code, body):
     """Create CORS-enabled response"""
     return {{
         'statusCode': status_code,
-        'headers': {{
-            'Access-Control-Allow-Origin': '*',
-            'Access-Control-Allow-Methods': 'GET, POST, OPTIONS',
-            'Access-Control-Allow-Headers': 'Content-Type, Authorization',
-            'Content-Type': 'application/json'
-        }},
-        'body': json.dumps(body) if isinstance(body, dict) else body
+        'headers': _CORS_HEADERS,
+        'body': body if isinstance(body, str) else _dumps(body)
     }}
 
+# /health only differs between calls by its timestamp, so the rest of the
+# body is serialized once (without its closing brace) and the timestamp is
+# appended per request
+_HEALTH_BODY_HEAD = _dumps({{
+    'status': 'healthy',
+    'service': 'PropertyPilot API',
+    'agentcore_endpoint': AGENTCORE_ENDPOINT
+}})[:-1]
+
 def handle_health():
     """Handle health check"""
-    return cors_response(200, {{
-        'status': 'healthy',
-        'service': 'PropertyPilot API',
-        'timestamp': datetime.now().isoformat(),
-        'agentcore_endpoint': AGENTCORE_ENDPOINT
-    }})
+    return cors_response(200, f'{{_HEALTH_BODY_HEAD}},"timestamp":"{{datetime.now().isoformat()}}"}}}}')
+
+# API info never changes, so the whole response is built once
+_INFO_RESPONSE = cors_response(200, {{
+    'service': 'PropertyPilot API',
+    'version': '1.0.0',
+    'description': 'Real Estate Investment Analysis API',
+    'endpoints': {{
+        'analyze': '/api/v1/analyze',
+        'health': '/health'
+    }}
+}})
 
 def handle_info():
     """Handle API info"""
-    return cors_response(200, {{
-        'service': 'PropertyPilot API',
-        'version': '1.0.0',
-        'description': 'Real Estate Investment Analysis API',
-        'endpoints': {{
-            'analyze': '/api/v1/analyze',
-            'health': '/health'
-        }}
-    }})
+    return _INFO_RESPONSE
+
+def parse_analysis_request(request_data):
+    """Validate an analysis request in one pass; returns (agentcore_input, error)"""
+    query = request_data.get('query')
+    location = request_data.get('location')
+    max_price = request_data.get('max_price')
+    
+    if not isinstance(query, str) or not query.strip():
+        return None, "Query is required"
+    if not isinstance(location, str) or not location.strip():
+        return None, "Location is required"
+    if type(max_price) not in (int, float) or max_price <= 0:
+        return None, "Max price must be greater than 0"
+    
+    return {{
+        "prompt": query.strip(),
+        "type": request_data.get('analysis_type', 'enhanced_analysis'),
+        "location": location.strip(),
+        "max_price": max_price,
+        "property_type": request_data.get('property_type', 'residential'),
+        "investment_strategy": request_data.get('investment_strategy', 'buy_hold')
+    }}, None
 
 def handle_analysis(event):
     """Handle investment analysis"""
@@ -108,35 +190,20 @@ def handle_analysis(event):
         # Parse request body
         body = event.get('body', '{{}}')
         if event.get('isBase64Encoded'):
-            import base64
-            body = base64.b64decode(body).decode('utf-8')
+            body = base64.b64decode(body)
         
-        request_data = json.loads(body)
-        logger.info(f"Analysis request: {{json.dumps(request_data)}}")
+        request_data = _loads(body)
+        if not isinstance(request_data, dict):
+            raise ValueError("Request body must be a JSON object")
+        logger.info(f"Analysis request: {{_dumps(request_data)}}")
         
-        # Validate request
-        query = request_data.get('query', '').strip()
-        location = request_data.get('location', '').strip()
-        max_price = request_data.get('max_price', 0)
+        # Validate request and prepare AgentCore payload
+        agentcore_input, error = parse_analysis_request(request_data)
+        if error:
+            return cors_response(400, {{"success": False, "error": error}})
         
-        if not query:
-            return cors_response(400, {{"success": False, "error": "Query is required"}})
-        if not location:
-            return cors_response(400, {{"success": False, "error": "Location is required"}})
-        if max_price <= 0:
-            return cors_response(400, {{"success": False, "error": "Max price must be greater than 0"}})
-        
-        # Prepare AgentCore payload
-        agentcore_payload = {{
-            "input": {{
-                "prompt": query,
-                "type": request_data.get('analysis_type', 'enhanced_analysis'),
-                "location": location,
-                "max_price": max_price,
-                "property_type": request_data.get('property_type', 'residential'),
-                "investment_strategy": request_data.get('investment_strategy', 'buy_hold')
-            }}
-        }}
+        location = agentcore_input['location']
+        agentcore_payload = {{"input": agentcore_input}}
         
         logger.info(f"Calling AgentCore: {{AGENTCORE_ENDPOINT}}")
         
@@ -144,22 +211,23 @@ def handle_analysis(event):
         response = http.request(
             'POST',
             AGENTCORE_ENDPOINT,
-            body=json.dumps(agentcore_payload),
-            headers={{'Content-Type': 'application/json'}},
-            timeout=120
+            body=_dumps(agentcore_payload),
+            headers={{'Content-Type': 'application/json', 'Connection': 'keep-alive'}}
         )
         
         logger.info(f"AgentCore response status: {{response.status}}")
         
         if response.status != 200:
-            logger.error(f"AgentCore error: {{response.status}} - {{response.data.decode('utf-8')}}")
+            # Bound the logged body; error pages can be large
+            logger.error(f"AgentCore error: {{response.status}} - {{response.data[:512]!r}}")
             return cors_response(503, {{
                 "success": False, 
                 "error": "Analysis service temporarily unavailable"
             }})
         
         # Process AgentCore response
-        agentcore_result = json.loads(response.data.decode('utf-8'))
+        # The parser takes the raw bytes; no intermediate str copy
+        agentcore_result = _loads(response.data)
         logger.info("AgentCore response received successfully")
         
         # Create clean response
@@ -169,7 +237,7 @@ def handle_analysis(event):
             'analysis_id': str(uuid.uuid4()),
             'timestamp': datetime.now().isoformat(),
             'location': location,
-            'analysis_type': request_data.get('analysis_type', 'enhanced_analysis'),
+            'analysis_type': agentcore_input['type'],
             'processing_time': 2.5,
             'confidence_score': 0.85,
             'results': process_agentcore_response(agentcore_result)
@@ -178,7 +246,10 @@ def handle_analysis(event):
         return cors_response(200, result)
         
     except json.JSONDecodeError:
+        # orjson.JSONDecodeError subclasses this one
         return cors_response(400, {{"success": False, "error": "Invalid JSON in request body"}})
+    except ValueError as e:
+        return cors_response(400, {{"success": False, "error": str(e)}})
     except Exception as e:
         logger.error(f"Analysis error: {{str(e)}}")
         return cors_response(503, {{
@@ -234,21 +305,17 @@ def update_lambda_function():
     print("🔧 Fixing PropertyPilot Lambda function...")
     
     try:
-        lambda_client = boto3.client('lambda')
+        lambda_client = _lambda()
         
         # Create fixed code
         lambda_code = create_fixed_lambda_code()
         
-        # Create ZIP file
-        with tempfile.NamedTemporaryFile(suffix='.zip', delete=False) as tmp_file:
-            with zipfile.ZipFile(tmp_file.name, 'w') as zipf:
-                zipf.writestr('lambda_function.py', lambda_code)
-            
-            zip_path = tmp_file.name
+        # Create ZIP file in memory
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED, compresslevel=6) as zipf:
+            zipf.writestr('lambda_function.py', lambda_code)
         
-        # Read ZIP content
-        with open(zip_path, 'rb') as f:
-            zip_content = f.read()
+        zip_content = buffer.getvalue()
         
         # Update function
         response = lambda_client.update_function_code(
@@ -256,15 +323,11 @@ def update_lambda_function():
             ZipFile=zip_content
         )
         
-        # Clean up
-        os.unlink(zip_path)
-        
         print("✅ Lambda function updated successfully")
         print(f"   Function ARN: {response['FunctionArn']}")
         
         # Wait for update to complete
         print("⏳ Waiting for function update to complete...")
-        import time
         time.sleep(10)
         
         return True
@@ -10,9 +10,27 @@ import os
 from datetime import datetime
 from dotenv import load_dotenv
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import requests
+    from requests.adapters import HTTPAdapter
+except ImportError:
+    requests = None
+
 # Load environment variables
 load_dotenv()
 
+# Shared HTTP session for endpoint tests, so repeated tests reuse the
+# keep-alive TLS connection
+_SESSION = None
+if requests is not None:
+    _SESSION = requests.Session()
+    _SESSION.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=1))
+
 def get_agentcore_endpoint():
     """Get the AgentCore endpoint URL from deployment info"""
     
@@ -73,9 +91,12 @@ def test_agentcore_endpoint(endpoint_url):
     
     print(f"🧪 Testing AgentCore endpoint: {endpoint_url}")
     
+    if _SESSION is None:
+        print("⚠️ 'requests' library not available for testing")
+        print("   Install with: pip install requests")
+        return None
+    
     try:
-        import requests
-        
         # Test payload
         test_payload = {
             "input": {
@@ -87,9 +108,10 @@ def test_agentcore_endpoint(endpoint_url):
         }
         
         # Make test request
-        response = requests.post(
+        body = orjson.dumps(test_payload) if orjson is not None else json.dumps(test_payload).encode()
+        response = _SESSION.post(
             endpoint_url,
-            json=test_payload,
+            data=body,
             headers={'Content-Type': 'application/json'},
             timeout=30
         )
@@ -105,10 +127,6 @@ def test_agentcore_endpoint(endpoint_url):
             print(f"   Response: {response.text}")
             return False
             
-    except ImportError:
-        print("⚠️ 'requests' library not available for testing")
-        print("   Install with: pip install requests")
-        return None
     except Exception as e:
         print(f"❌ AgentCore endpoint test failed: {e}")
         return False
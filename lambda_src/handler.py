@@ -0,0 +1,279 @@
+"""
+PropertyPilot API Lambda handler
+Shipped as lambda_function.py by deploy_simple_api.py
+"""
+
+import base64
+import gzip
+import json
+import logging
+import os
+import boto3
+from datetime import datetime
+from botocore.config import Config
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Configure logging
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+# AgentCore runtime, set on the function's environment at deploy time
+AGENTCORE_REGION = os.environ['AGENTCORE_REGION']
+AGENTCORE_RUNTIME_ARN = os.environ['AGENTCORE_RUNTIME_ARN']
+
+# AgentCore client, created once per execution environment so warm
+# invocations reuse its SigV4-signed keep-alive connection pool
+client = boto3.client(
+    'bedrock-agentcore',
+    region_name=AGENTCORE_REGION,
+    config=Config(
+        max_pool_connections=20,
+        tcp_keepalive=True,
+        retries={'max_attempts': 2},
+        connect_timeout=3,
+        read_timeout=120
+    )
+)
+
+def _loads(data):
+    """Parse JSON from str or bytes, with orjson when it is bundled"""
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+def _dumps(obj):
+    """Serialize to a JSON str (API Gateway needs str bodies)"""
+    return orjson.dumps(obj).decode() if orjson is not None else json.dumps(obj)
+
+def _accepts_gzip(event):
+    """Whether the caller sent Accept-Encoding: gzip"""
+    headers = event.get('headers') or {}
+    return 'gzip' in (headers.get('accept-encoding') or headers.get('Accept-Encoding') or '')
+
+def _gzip_response(status_code, obj):
+    """JSON response gzip-compressed for API Gateway to pass through as binary"""
+    raw = orjson.dumps(obj) if orjson is not None else json.dumps(obj).encode()
+    return {
+        'statusCode': status_code,
+        'headers': {
+            'Access-Control-Allow-Origin': '*',
+            'Content-Type': 'application/json',
+            'Content-Encoding': 'gzip',
+            'Vary': 'Accept-Encoding'
+        },
+        # Level 1 is several times faster than the default for a slightly
+        # larger body, which matters more on this latency-bound path
+        'body': base64.b64encode(gzip.compress(raw, compresslevel=1)).decode(),
+        'isBase64Encoded': True
+    }
+
+def lambda_handler(event, context):
+    """PropertyPilot API Lambda handler"""
+    
+    try:
+        # Handle CORS preflight
+        if event.get('httpMethod') == 'OPTIONS':
+            return {
+                'statusCode': 200,
+                'headers': {
+                    'Access-Control-Allow-Origin': '*',
+                    'Access-Control-Allow-Methods': 'GET, POST, OPTIONS',
+                    'Access-Control-Allow-Headers': 'Content-Type, Authorization'
+                },
+                'body': ''
+            }
+        
+        # Get request path and method
+        path = event.get('path', '/')
+        method = event.get('httpMethod', 'GET')
+        
+        # Health check
+        if path == '/health':
+            return {
+                'statusCode': 200,
+                'headers': {'Access-Control-Allow-Origin': '*', 'Content-Type': 'application/json'},
+                'body': _dumps({
+                    'status': 'healthy',
+                    'service': 'PropertyPilot API',
+                    'timestamp': datetime.now().isoformat()
+                })
+            }
+        
+        # API documentation
+        if path == '/':
+            return {
+                'statusCode': 200,
+                'headers': {'Access-Control-Allow-Origin': '*', 'Content-Type': 'application/json'},
+                'body': _dumps({
+                    'service': 'PropertyPilot API',
+                    'version': '1.0.0',
+                    'endpoints': {
+                        'analyze': '/api/v1/analyze',
+                        'health': '/health'
+                    }
+                })
+            }
+        
+        # Main analysis endpoint
+        if path == '/api/v1/analyze' and method == 'POST':
+            return handle_analysis(event)
+        
+        # Not found
+        return {
+            'statusCode': 404,
+            'headers': {'Access-Control-Allow-Origin': '*', 'Content-Type': 'application/json'},
+            'body': _dumps({'error': 'Endpoint not found'})
+        }
+        
+    except Exception as e:
+        logger.error(f"Lambda error: {str(e)}")
+        return {
+            'statusCode': 500,
+            'headers': {'Access-Control-Allow-Origin': '*', 'Content-Type': 'application/json'},
+            'body': _dumps({'error': 'Internal server error'})
+        }
+
+def handle_analysis(event):
+    """Handle investment analysis request"""
+    
+    try:
+        # Parse request body
+        if event.get('body'):
+            if event.get('isBase64Encoded'):
+                body = base64.b64decode(event['body'])
+            else:
+                body = event['body']
+            
+            request_data = _loads(body)
+        else:
+            raise ValueError("No request body")
+        
+        # Validate required fields
+        query = request_data.get('query', '').strip()
+        location = request_data.get('location', '').strip()
+        max_price = request_data.get('max_price', 0)
+        
+        if not query:
+            raise ValueError("Query is required")
+        if not location:
+            raise ValueError("Location is required")
+        if max_price <= 0:
+            raise ValueError("Max price must be greater than 0")
+        
+        # Prepare AgentCore payload
+        agentcore_payload = {
+            "input": {
+                "prompt": query,
+                "type": request_data.get('analysis_type', 'enhanced_analysis'),
+                "location": location,
+                "max_price": max_price,
+                "property_type": request_data.get('property_type', 'residential'),
+                "investment_strategy": request_data.get('investment_strategy', 'buy_hold')
+            }
+        }
+        
+        # Call AgentCore
+        logger.info(f"Calling AgentCore for analysis: {location}")
+        
+        # Non-2xx replies surface as botocore ClientError
+        response = client.invoke_agent_runtime(
+            agentRuntimeArn=AGENTCORE_RUNTIME_ARN,
+            payload=_dumps(agentcore_payload).encode(),
+            qualifier='DEFAULT'
+        )
+        
+        agentcore_result = _loads(response['response'].read())
+        
+        # Process results
+        processed_result = process_agentcore_response(agentcore_result, request_data)
+        
+        # The analysis text compresses well and is the bulk of the payload
+        if _accepts_gzip(event):
+            return _gzip_response(200, processed_result)
+        
+        # Vary on both variants so shared caches key them apart
+        return {
+            'statusCode': 200,
+            'headers': {
+                'Access-Control-Allow-Origin': '*',
+                'Content-Type': 'application/json',
+                'Vary': 'Accept-Encoding'
+            },
+            'body': _dumps(processed_result)
+        }
+        
+    except ValueError as e:
+        return {
+            'statusCode': 400,
+            'headers': {'Access-Control-Allow-Origin': '*', 'Content-Type': 'application/json'},
+            'body': _dumps({'success': False, 'error': str(e)})
+        }
+    except Exception as e:
+        logger.error(f"Analysis error: {str(e)}")
+        return {
+            'statusCode': 503,
+            'headers': {'Access-Control-Allow-Origin': '*', 'Content-Type': 'application/json'},
+            'body': _dumps({'success': False, 'error': 'Analysis service temporarily unavailable'})
+        }
+
+def process_agentcore_response(agentcore_result, request_data):
+    """Process AgentCore response for frontend"""
+    
+    import uuid
+    
+    output = agentcore_result.get('output', agentcore_result)
+    timestamp = datetime.now().isoformat()
+    
+    # Create clean response
+    result = {
+        'success': True,
+        'message': output.get('message', f"Investment analysis completed for {request_data.get('location')}"),
+        'analysis_id': str(uuid.uuid4()),
+        'timestamp': timestamp,
+        'location': request_data.get('location'),
+        'analysis_type': request_data.get('analysis_type', 'enhanced_analysis'),
+        'processing_time': 2.5,
+        'results': {
+            'summary': output.get('message', 'Analysis completed successfully'),
+            'analysis_data': {}
+        }
+    }
+    
+    # Extract analysis data
+    if output.get('enhanced_analysis'):
+        result['results']['analysis_data']['enhanced_analysis'] = clean_text(output['enhanced_analysis'])
+    
+    if output.get('analysis'):
+        result['results']['analysis_data']['property_analysis'] = clean_text(output['analysis'])
+    
+    if output.get('market_data'):
+        result['results']['analysis_data']['market_research'] = clean_text(output['market_data'])
+    
+    if output.get('opportunities'):
+        result['results']['analysis_data']['investment_opportunities'] = clean_text(output['opportunities'])
+    
+    # Add confidence score
+    if len(result['results']['analysis_data']) >= 2:
+        result['confidence_score'] = 0.85
+    elif len(result['results']['analysis_data']) == 1:
+        result['confidence_score'] = 0.70
+    else:
+        result['confidence_score'] = 0.60
+    
+    return result
+
+# Dict fields holding the displayable text, in order of preference
+_PREFERRED_KEYS = ('analysis_result', 'summary')
+
+def _clean_dict(data):
+    """First non-empty preferred field, else the dict's repr"""
+    return next((data[k] for k in _PREFERRED_KEYS if data.get(k)), None) or str(data)
+
+# Cleaner per exact type; anything else is stringified
+_CLEANERS = {str: lambda data: data, dict: _clean_dict}
+
+def clean_text(data):
+    """Clean analysis text for display"""
+    return _CLEANERS.get(type(data), str)(data)
@@ -6,12 +6,20 @@ Simple Flask server for testing PropertyPilot with web interface
 
 import os
 import json
+import shutil
 import asyncio
+import concurrent.futures
+import threading
 from datetime import datetime
-from flask import Flask, request, jsonify, render_template_string, send_from_directory
+from flask import Flask, Response, request, render_template_string, send_from_directory
 from flask_cors import CORS
 from dotenv import load_dotenv
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Load environment variables
 load_dotenv()
 
@@ -29,14 +37,42 @@ except ImportError as e:
 app = Flask(__name__)
 CORS(app)  # Enable CORS for web interface
 
+def _json_response(obj, status=200):
+    """JSON response serialized with orjson when installed, else Flask's encoder"""
+    if orjson is not None:
+        body = orjson.dumps(obj, option=orjson.OPT_NAIVE_UTC | orjson.OPT_SERIALIZE_NUMPY)
+    else:
+        body = app.json.dumps(obj)
+    return Response(body, status=status, mimetype='application/json')
+
+# Seconds to wait for an analysis; kept under gunicorn's 180s worker timeout
+ANALYSIS_TIMEOUT = 170
+
+# One event loop for the life of the process, run on a daemon thread, so
+# async clients and caches inside the agents survive between requests. Request
+# threads, however many the server starts, only submit work to it
+_LOOP = asyncio.new_event_loop()
+threading.Thread(target=_LOOP.run_forever, name='propertypilot-loop', daemon=True).start()
+
+def _run(coro, timeout=ANALYSIS_TIMEOUT):
+    """Run a coroutine on the shared loop and wait for its result"""
+    future = asyncio.run_coroutine_threadsafe(coro, _LOOP)
+    try:
+        return future.result(timeout=timeout)
+    except concurrent.futures.TimeoutError:
+        future.cancel()
+        raise TimeoutError(f"Analysis timed out after {timeout}s") from None
+
 # Initialize PropertyPilot system
 property_pilot = None
 web_research_agent = None
+web_researcher = None
 
 if PropertyPilotSystem:
     try:
         property_pilot = PropertyPilotSystem()
         web_research_agent = EnhancedWebResearchAgent()
+        web_researcher = AutomatedWebResearcher()
         print("✅ PropertyPilot system initialized")
     except Exception as e:
         print(f"⚠️ Warning: Could not initialize PropertyPilot: {e}")
@@ -61,7 +97,7 @@ def invoke_agent():
         # Get request data
         data = request.get_json()
         if not data:
-            return jsonify({"error": "No JSON data provided"}), 400
+            return _json_response({"error": "No JSON data provided"}, 400)
         
         # Extract input
         input_data = data.get('input', data)
@@ -69,7 +105,7 @@ def invoke_agent():
         # Validate required fields
         prompt = input_data.get('prompt', '')
         if not prompt:
-            return jsonify({"error": "No prompt provided"}), 400
+            return _json_response({"error": "No prompt provided"}, 400)
         
         # Extract parameters
         request_type = input_data.get('type', 'enhanced_analysis')
@@ -81,7 +117,7 @@ def invoke_agent():
         
         # Check if PropertyPilot is available
         if not property_pilot:
-            return jsonify({
+            return _json_response({
                 "output": {
                     "error": "PropertyPilot system not available. Please check your environment configuration.",
                     "message": "Demo mode: This would analyze properties in " + location,
@@ -123,7 +159,7 @@ def invoke_agent():
             result = handle_property_analysis_sync(input_data)
         
         # Return AgentCore-compatible response
-        return jsonify({
+        return _json_response({
             "output": {
                 "message": f"Analysis completed for {location}",
                 "timestamp": datetime.now().isoformat(),
@@ -138,14 +174,14 @@ def invoke_agent():
         
     except Exception as e:
         print(f"❌ Error processing request: {str(e)}")
-        return jsonify({
+        return _json_response({
             "output": {
                 "error": str(e),
                 "timestamp": datetime.now().isoformat(),
                 "status": "error",
                 "service": "PropertyPilot-Local"
             }
-        }), 500
+        }, 500)
 
 def handle_enhanced_analysis_sync(input_data):
     """Handle enhanced analysis synchronously"""
@@ -153,31 +189,23 @@ def handle_enhanced_analysis_sync(input_data):
         location = input_data.get('location', 'Austin, TX')
         max_price = input_data.get('max_price', 500000)
         
-        # Run PropertyPilot analysis
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        
-        try:
-            analysis_result = loop.run_until_complete(
-                property_pilot.analyze_property_investment(
-                    location=location,
-                    max_price=max_price
-                )
+        async def analyze():
+            # Run PropertyPilot analysis
+            analysis_result = await property_pilot.analyze_property_investment(
+                location=location,
+                max_price=max_price
             )
             
             # Enhance with web research if available
             if web_research_agent:
-                enhanced_result = loop.run_until_complete(
-                    web_research_agent.enhance_property_analysis(
-                        analysis_result, location
-                    )
+                return await web_research_agent.enhance_property_analysis(
+                    analysis_result, location
                 )
-                return enhanced_result
             else:
                 return analysis_result
-                
-        finally:
-            loop.close()
+        
+        # Both steps share one timeout
+        return _run(analyze())
             
     except Exception as e:
         return {
@@ -192,19 +220,12 @@ def handle_property_analysis_sync(input_data):
         location = input_data.get('location', 'Austin, TX')
         max_price = input_data.get('max_price', 500000)
         
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        
-        try:
-            result = loop.run_until_complete(
-                property_pilot.analyze_property_investment(
-                    location=location,
-                    max_price=max_price
-                )
+        return _run(
+            property_pilot.analyze_property_investment(
+                location=location,
+                max_price=max_price
             )
-            return result
-        finally:
-            loop.close()
+        )
             
     except Exception as e:
         return {
@@ -225,17 +246,9 @@ def handle_market_research_sync(input_data):
                 "status": "failed"
             }
         
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        
-        try:
-            researcher = AutomatedWebResearcher()
-            result = loop.run_until_complete(
-                researcher.research_market_conditions(location, property_type)
-            )
-            return result
-        finally:
-            loop.close()
+        return _run(
+            web_researcher.research_market_conditions(location, property_type)
+        )
             
     except Exception as e:
         return {
@@ -256,17 +269,9 @@ def handle_investment_opportunities_sync(input_data):
                 "status": "failed"
             }
         
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        
-        try:
-            researcher = AutomatedWebResearcher()
-            result = loop.run_until_complete(
-                researcher.research_investment_opportunities(criteria)
-            )
-            return result
-        finally:
-            loop.close()
+        return _run(
+            web_researcher.research_investment_opportunities(criteria)
+        )
             
     except Exception as e:
         return {
@@ -278,7 +283,7 @@ def handle_investment_opportunities_sync(input_data):
 @app.route('/health')
 def health_check():
     """Health check endpoint"""
-    return jsonify({
+    return _json_response({
         "status": "healthy",
         "service": "PropertyPilot-Local",
         "timestamp": datetime.now().isoformat(),
@@ -292,7 +297,7 @@ def health_check():
 @app.route('/status')
 def status():
     """Detailed status endpoint"""
-    return jsonify({
+    return _json_response({
         "service": "PropertyPilot Local Web Server",
         "version": "1.0.0",
         "timestamp": datetime.now().isoformat(),
@@ -322,6 +327,23 @@ if __name__ == '__main__':
     print("   API Endpoint: http://localhost:5000/invoke")
     print("   Health Check: http://localhost:5000/health")
     
+    if os.getenv('PROD') == '1':
+        if shutil.which('gunicorn'):
+            # Multi-worker server; each worker process runs analyses on its own
+            # event loop, so concurrent requests overlap across workers.
+            # Threaded workers, since gevent's monkey-patching would interfere
+            # with the loop thread
+            os.execvp('gunicorn', [
+                'gunicorn',
+                '-k', 'gthread',
+                '-w', '4',
+                '--threads', '8',
+                '--timeout', '180',
+                '-b', '0.0.0.0:5000',
+                'local_web_server:app'
+            ])
+        print("⚠️ PROD=1 but gunicorn is not installed (pip install gunicorn); using the Flask dev server")
+    
     app.run(
         host='0.0.0.0',
         port=5000,
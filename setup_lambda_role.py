@@ -27,6 +27,18 @@ def create_lambda_execution_role():
         ]
     }
     
+    # Lets the API function call AgentCore directly with SigV4
+    agentcore_policy = {
+        "Version": "2012-10-17",
+        "Statement": [
+            {
+                "Effect": "Allow",
+                "Action": "bedrock-agentcore:InvokeAgentRuntime",
+                "Resource": "*"
+            }
+        ]
+    }
+    
     role_name = 'PropertyPilot-Lambda-Role'
     
     try:
@@ -47,6 +59,14 @@ def create_lambda_execution_role():
         
         print("✅ Attached basic execution policy")
         
+        iam.put_role_policy(
+            RoleName=role_name,
+            PolicyName='PropertyPilot-AgentCore-Invoke',
+            PolicyDocument=json.dumps(agentcore_policy)
+        )
+        
+        print("✅ Attached AgentCore invoke policy")
+        
         # Wait for role to be available
         print("⏳ Waiting for role to be available...")
         time.sleep(10)
@@ -58,6 +78,13 @@ def create_lambda_execution_role():
         # Role already exists, get its ARN
         response = iam.get_role(RoleName=role_name)
         role_arn = response['Role']['Arn']
+        
+        # Roles created before the API called AgentCore directly lack this
+        iam.put_role_policy(
+            RoleName=role_name,
+            PolicyName='PropertyPilot-AgentCore-Invoke',
+            PolicyDocument=json.dumps(agentcore_policy)
+        )
         print(f"✅ Using existing IAM role: {role_name}")
         return role_arn
     
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Test the Lambda packaging helpers used when wiring AgentCore to the API
+"""
+
+import os
+import stat
+import sys
+import zipfile
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from connect_agentcore_to_api import MMAP_THRESHOLD, replace_endpoint_default, write_zip_entries
+
+SOURCE = '''# Café-configured endpoint — “smart quotes” précèdent la valeur
+import os
+
+AGENTCORE_ENDPOINT = os.getenv("AGENTCORE_ENDPOINT", "https://old.example/é")  # défaut
+REGION = "eu-west-1"
+'''
+
+def test_endpoint_default_is_replaced_in_non_ascii_source():
+    """Only the default literal changes, even with multi-byte characters before it"""
+    updated = replace_endpoint_default(SOURCE, 'https://new.example/invocations')
+
+    assert updated == SOURCE.replace('"https://old.example/é"', '"https://new.example/invocations"')
+
+def test_unchanged_endpoint_returns_none():
+    """Nothing to write when the default already matches"""
+    assert replace_endpoint_default(SOURCE, 'https://old.example/é') is None
+
+def test_missing_assignment_returns_none():
+    """Sources without the assignment are left alone"""
+    assert replace_endpoint_default('REGION = "eu-west-1"\n', 'https://new.example') is None
+
+def write_package(tmp_path, files):
+    """Write {arcname: (data, mode)} to disk, zip it with write_zip_entries, return the zip path"""
+    entries = []
+    for arcname, (data, mode) in files.items():
+        path = tmp_path / 'src' / arcname
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+        path.chmod(mode)
+        entries.append((str(path), arcname))
+
+    zip_path = tmp_path / 'package.zip'
+    with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
+        write_zip_entries(zipf, entries, batch_size=2)
+    return zip_path
+
+def assert_round_trip(zip_path, files):
+    """Contents, permission bits and compression survive the zip"""
+    with zipfile.ZipFile(zip_path) as zipf:
+        assert zipf.testzip() is None
+        assert sorted(zipf.namelist()) == sorted(files)
+        for arcname, (data, mode) in files.items():
+            info = zipf.getinfo(arcname)
+            assert zipf.read(arcname) == data
+            assert stat.S_IMODE(info.external_attr >> 16) == mode
+            assert info.compress_type == zipfile.ZIP_DEFLATED
+
+def test_zip_entries_round_trip_with_modes(tmp_path):
+    """Entries keep their on-disk mode across several read batches"""
+    files = {
+        'bin/tool': (b'#!/bin/sh\necho ok\n', 0o755),
+        'pkg/module.py': ('print("héllo")\n'.encode('utf-8'), 0o644),
+        'pkg/data.json': (b'{}', 0o640),
+        'pkg/empty.txt': (b'', 0o600),
+    }
+
+    assert_round_trip(write_package(tmp_path, files), files)
+
+def test_large_files_round_trip_through_mmap(tmp_path):
+    """Files at or over MMAP_THRESHOLD are zipped from a mapping with the same result"""
+    files = {
+        'pkg/exact.bin': (os.urandom(MMAP_THRESHOLD), 0o644),
+        'pkg/large.so': (os.urandom(MMAP_THRESHOLD + 1), 0o755),
+        'pkg/small.py': (b'x = 1\n', 0o644),
+    }
+
+    assert_round_trip(write_package(tmp_path, files), files)
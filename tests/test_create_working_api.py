@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Test the pre-serialized analysis response in the minimal API Lambda
+"""
+
+import json
+import os
+import sys
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from create_working_api import create_minimal_lambda
+
+@pytest.fixture
+def lambda_module():
+    """Namespace of the generated minimal handler"""
+    namespace = {}
+    exec(compile(create_minimal_lambda(), 'lambda_function.py', 'exec'), namespace)
+    return namespace
+
+def fill(value, location, query, analysis_type):
+    """Substitute the placeholders into the unserialized template, as the old code did"""
+    if isinstance(value, dict):
+        return {k: fill(v, location, query, analysis_type) for k, v in value.items()}
+    if value == '@@LOCATION_VALUE@@':
+        return location
+    if value == '@@ANALYSIS_TYPE@@':
+        return analysis_type
+    if isinstance(value, str):
+        return value.replace('@@LOCATION@@', str(location)).replace('@@QUERY@@', str(query))
+    return value
+
+@pytest.mark.parametrize('location, query, analysis_type', [
+    ('Austin, TX', 'best rental yield', 'enhanced_analysis'),
+    ('São Paulo — Centro', 'où investir? 東京 "quoted" \\ back\nslash', 'market_research'),
+    ('</script>\t ', '@@LOCATION@@', None),
+    (None, 12345, 'property_analysis'),
+])
+def test_render_matches_json_dumps(lambda_module, location, query, analysis_type):
+    """Rendering is byte-identical to json.dumps of the filled-in response"""
+    template = json.loads(lambda_module['_ANALYSIS_TEMPLATE'])
+    expected = json.dumps(fill(template, location, query, analysis_type))
+
+    assert lambda_module['render_analysis'](location, query, analysis_type) == expected
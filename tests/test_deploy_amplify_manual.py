@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+Test the Amplify manual deployment packaging
+"""
+
+import os
+import sys
+import zipfile
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from deploy_amplify_manual import create_deployment_package
+
+def test_lone_index_is_returned_unzipped(tmp_path, monkeypatch):
+    """A lone index.html is uploaded as-is"""
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / 'index.html').write_text('<html></html>')
+
+    assert create_deployment_package() == 'index.html'
+
+def test_lone_build_spec_is_still_zipped(tmp_path, monkeypatch):
+    """amplify.yml on its own is not a website, so it is not handed back bare"""
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / 'amplify.yml').write_text('version: 1\n')
+
+    package = create_deployment_package()
+
+    assert package.endswith('.zip')
+    with zipfile.ZipFile(package) as zipf:
+        assert zipf.namelist() == ['amplify.yml']
+
+def test_no_website_files_fails(tmp_path, monkeypatch):
+    """Nothing to package raises instead of producing an empty zip"""
+    monkeypatch.chdir(tmp_path)
+
+    with pytest.raises(FileNotFoundError):
+        create_deployment_package()
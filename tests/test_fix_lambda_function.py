@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Test request validation in the generated PropertyPilot API Lambda
+"""
+
+import json
+import os
+import sys
+from unittest.mock import MagicMock
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fix_lambda_function import create_fixed_lambda_code
+
+VALID_REQUEST = {'query': 'rental yield', 'location': 'Austin, TX', 'max_price': 500000}
+
+@pytest.fixture
+def lambda_module(monkeypatch):
+    """Namespace of the generated handler, with the AgentCore HTTP pool mocked out"""
+    monkeypatch.setitem(sys.modules, 'urllib3', MagicMock())
+    namespace = {}
+    exec(compile(create_fixed_lambda_code(), 'lambda_function.py', 'exec'), namespace)
+    # Forget the warm-up HEAD sent at import
+    namespace['http'].reset_mock()
+    return namespace
+
+def analysis_event(body):
+    """API Gateway event for POST /api/analyze"""
+    return {
+        'rawPath': '/api/analyze',
+        'requestContext': {'http': {'method': 'POST'}},
+        'body': body,
+    }
+
+def test_valid_request_is_accepted(lambda_module):
+    """A well-formed request becomes the AgentCore input"""
+    agentcore_input, error = lambda_module['parse_analysis_request'](dict(VALID_REQUEST, query='  rental yield '))
+
+    assert error is None
+    assert agentcore_input['prompt'] == 'rental yield'
+    assert agentcore_input['location'] == 'Austin, TX'
+    assert agentcore_input['max_price'] == 500000
+
+@pytest.mark.parametrize('field, value, message', [
+    ('query', 42, 'Query is required'),
+    ('query', ['rental yield'], 'Query is required'),
+    ('query', '   ', 'Query is required'),
+    ('location', {'city': 'Austin'}, 'Location is required'),
+    ('location', None, 'Location is required'),
+    ('max_price', True, 'Max price must be greater than 0'),
+    ('max_price', '500000', 'Max price must be greater than 0'),
+    ('max_price', 0, 'Max price must be greater than 0'),
+])
+def test_invalid_field_is_rejected_with_400(lambda_module, field, value, message):
+    """Wrongly typed or empty fields get a 400 instead of reaching AgentCore"""
+    body = json.dumps(dict(VALID_REQUEST, **{field: value}))
+
+    response = lambda_module['handle_analysis'](analysis_event(body))
+
+    assert response['statusCode'] == 400
+    assert json.loads(response['body']) == {'success': False, 'error': message}
+    lambda_module['http'].request.assert_not_called()
+
+def test_malformed_json_is_rejected_with_400(lambda_module):
+    """A body that is not JSON is a client error"""
+    response = lambda_module['handle_analysis'](analysis_event('{"query": '))
+
+    assert response['statusCode'] == 400
+
+@pytest.mark.parametrize('body', [[VALID_REQUEST], [], 'x', 3, None])
+def test_non_object_body_is_rejected_with_400(lambda_module, body):
+    """Valid JSON that is not an object is a client error"""
+    response = lambda_module['handle_analysis'](analysis_event(json.dumps(body)))
+
+    assert response['statusCode'] == 400
+    assert json.loads(response['body']) == {'success': False, 'error': 'Request body must be a JSON object'}
+    lambda_module['http'].request.assert_not_called()